@@ -0,0 +1,146 @@
+"""
+특징점 매칭 방식별 정렬 속도/품질 비교
+
+사용법:
+    python -m benchmarks.bench_aligner 템플릿.png 스캔1.png 스캔2.png ...
+    python -m benchmarks.bench_aligner 템플릿.png 스캔폴더 --repeat 3 --pyramid
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.constants import AppConfig
+from core.image_aligner import ImageAligner
+from core.image_loader import ImageLoader
+
+MATCHERS = (
+    "legacy",
+    ImageAligner.MATCHER_BF,
+    ImageAligner.MATCHER_RATIO,
+    ImageAligner.MATCHER_FLANN,
+)
+
+
+def collect_files(paths):
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(
+                sorted(
+                    p for p in path.iterdir() if p.suffix.lower() in AppConfig.IMG_EXTS
+                )
+            )
+        elif path.exists():
+            files.append(path)
+    return files
+
+
+def run_legacy(image, template_img):
+    # 기존 구현: 매번 템플릿 특징점을 다시 검출하고 Python 루프로 좌표 구성
+    start = time.perf_counter()
+    _, matrix = ImageAligner.align_images(image, template_img)
+    return matrix, time.perf_counter() - start
+
+
+def run_matcher(image, template_path, matcher, pyramid, args):
+    result = ImageAligner.align(
+        image,
+        template_path,
+        pyramid=pyramid,
+        max_features=args.max_features,
+        good_match_percent=args.good_match_percent,
+        matcher=matcher,
+    )
+    return result.matrix, result.elapsed
+
+
+def corner_error(matrix, reference, shape):
+    # 템플릿 네 모서리를 두 행렬로 역투영했을 때의 최대 차이 (px)
+    if matrix is None or reference is None:
+        return float("nan")
+
+    h, w = shape
+    corners = np.array([[0, 0, 1], [w, 0, 1], [0, h, 1], [w, h, 1]], dtype=float).T
+
+    def project(m):
+        pts = np.linalg.inv(m) @ corners
+        return pts[:2] / pts[2]
+
+    return float(np.abs(project(matrix) - project(reference)).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ImageAligner 매칭 방식 비교")
+    parser.add_argument("template", help="템플릿(서식 원본) 이미지")
+    parser.add_argument("scans", nargs="+", help="스캔 이미지 또는 폴더")
+    parser.add_argument("--repeat", type=int, default=1, help="파일당 반복 횟수")
+    parser.add_argument("--pyramid", action="store_true", help="피라미드 정렬 사용")
+    parser.add_argument("--max-features", type=int, default=ImageAligner.MAX_FEATURES)
+    parser.add_argument(
+        "--good-match-percent", type=float, default=ImageAligner.GOOD_MATCH_PERCENT
+    )
+    args = parser.parse_args()
+
+    files = collect_files(args.scans)
+    template_img = ImageLoader.load_image(args.template)
+    if template_img is None or not files:
+        print("[ERROR] 템플릿 또는 스캔 이미지를 읽을 수 없습니다.")
+        return 1
+
+    # 템플릿 특징점 캐시를 미리 채워 첫 파일이 불리하지 않게 한다
+    max_side = ImageAligner.PYRAMID_MAX_SIDE if args.pyramid else 0
+    ImageAligner.get_template_features(args.template, max_side, args.max_features)
+
+    stats = {name: {"time": [], "fail": 0, "diff": []} for name in MATCHERS}
+
+    for file_path in files:
+        image = ImageLoader.load_image(file_path)
+        if image is None:
+            print(f"[SKIP] 로드 실패: {file_path.name}")
+            continue
+
+        reference = None
+        for name in MATCHERS:
+            for _ in range(args.repeat):
+                if name == "legacy":
+                    matrix, elapsed = run_legacy(image, template_img)
+                else:
+                    matrix, elapsed = run_matcher(
+                        image, args.template, name, args.pyramid, args
+                    )
+                stats[name]["time"].append(elapsed)
+
+            if matrix is None:
+                stats[name]["fail"] += 1
+            elif name == "legacy":
+                reference = matrix
+            else:
+                stats[name]["diff"].append(
+                    corner_error(matrix, reference, template_img.shape[:2])
+                )
+
+        print(f"{file_path.name}: 완료")
+
+    print()
+    print(
+        f"{'방식':<8} {'평균(ms)':>10} {'최대(ms)':>10} {'실패':>6} {'기존 대비 오차(px)':>18}"
+    )
+    for name in MATCHERS:
+        times = np.array(stats[name]["time"]) * 1000
+        diffs = np.array(stats[name]["diff"])
+        diff_text = f"{np.nanmedian(diffs):.2f}" if diffs.size else "-"
+        print(
+            f"{name:<8} {times.mean():>10.1f} {times.max():>10.1f} "
+            f"{stats[name]['fail']:>6} {diff_text:>18}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
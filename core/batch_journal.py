@@ -0,0 +1,114 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from core.constants import AppConfig
+
+
+class BatchJournal:
+    """
+    배치 결과를 문서(페이지)가 끝날 때마다 기록하는 SQLite 저널
+    (프로그램이 종료되거나 중지해도 완료된 결과는 남고, 다음 배치에서 이어서 처리)
+    중지 없이 끝까지 완료한 배치의 기록은 지운다 (forget).
+
+    기록은 모아서 한 트랜잭션으로 커밋한다 (WAL + synchronous=NORMAL, 행마다 fsync 없음).
+    키 : (파일 경로, 페이지) - 파일 식별값(수정 시각/크기)과 서식 버전을 함께 저장
+    """
+
+    COMMIT_ROWS = 50  # 이만큼 쌓이면 커밋
+    COMMIT_SECONDS = 2.0  # 마지막 커밋 후 이 시간이 지나면 커밋
+
+    def __init__(self, db_path: Union[str, Path] = AppConfig.JOURNAL_PATH):
+        self.db_path = Path(db_path)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rows (
+                path TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                page_count INTEGER NOT NULL,
+                file_stamp TEXT NOT NULL,
+                profile_name TEXT NOT NULL,
+                profile_version TEXT NOT NULL,
+                row_data TEXT NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (path, page)
+            )
+            """)
+        self._conn.commit()
+
+        self._pending: List[tuple] = []
+        self._last_commit = time.monotonic()
+
+    def record(
+        self,
+        path: str,
+        page: int,
+        page_count: int,
+        file_stamp: str,
+        profile_name: str,
+        profile_version: str,
+        row_data: Dict[str, Any],
+    ) -> None:
+        self._pending.append(
+            (
+                path,
+                page,
+                page_count,
+                file_stamp,
+                profile_name,
+                profile_version,
+                json.dumps(row_data, ensure_ascii=False, default=str),
+                time.time(),
+            )
+        )
+
+        if (
+            len(self._pending) >= self.COMMIT_ROWS
+            or time.monotonic() - self._last_commit >= self.COMMIT_SECONDS
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._pending,
+                )
+            self._pending.clear()
+        self._last_commit = time.monotonic()
+
+    def completed_rows(
+        self, path: str, file_stamp: str
+    ) -> Optional[List[Tuple[str, str, Dict[str, Any]]]]:
+        """
+        파일의 모든 페이지가 기록되어 있으면 [(서식 이름, 서식 버전, row_data), ...] (페이지 순)
+        파일이 바뀌었거나(file_stamp) 일부 페이지만 있으면 None
+        """
+        rows = self._conn.execute(
+            "SELECT page_count, profile_name, profile_version, row_data FROM rows"
+            " WHERE path = ? AND file_stamp = ? ORDER BY page",
+            (path, file_stamp),
+        ).fetchall()
+
+        if not rows or len(rows) != rows[0][0]:
+            return None
+        return [(name, version, json.loads(data)) for _, name, version, data in rows]
+
+    def forget(self, paths: Sequence[str]) -> None:
+        # 끝까지 완료한 배치의 기록 삭제 (이어할 작업이 없으므로 저널이 계속 커지지 않도록)
+        self.flush()
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM rows WHERE path = ?", [(path,) for path in paths]
+            )
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
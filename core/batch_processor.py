@@ -1,12 +1,34 @@
+import json
 import time
+import threading
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 from PySide6.QtCore import QThread, Signal
 
+from core.constants import AppConfig
 from core.ocr_engine import OCREngine
-from core.profile_manager import ProfileManager
 from core.image_loader import ImageLoader
 from core.image_aligner import ImageAligner
+from core.image_cache import ImageCache
+from core.batch_journal import BatchJournal
+from core.result_store import ResultStore
+from core.profile_manager import ProfileManager
+from core.prefetch_loader import PrefetchLoader
+from core.pipeline import (
+    StagedPipeline,
+    StageError,
+    make_task,
+    make_row_data,
+    document_name,
+    full_resolution_matrix,
+    iter_page_tasks,
+    load_stage,
+    align_stage,
+    ocr_stage,
+    get_roi_crops,
+    set_confidences,
+    OCR_STAT_NAMES,
+)
 
 
 class BatchProcessor(QThread):
@@ -15,57 +37,161 @@ class BatchProcessor(QThread):
     finished_signal = Signal(str)
     results_ready_signal = Signal(dict)
 
-    def __init__(self, file_list: List[str], forced_profile_name: Optional[str] = None):
+    # OCR 방식
+    MODE_ROI = "roi"  # ROI마다 개별 인식
+    MODE_PAGE = "page"  # 한 페이지의 ROI를 합성하여 한 번에 인식
+    MODE_COLUMN = "column"  # 여러 문서의 같은 ROI를 모아 한 번에 인식
+
+    COLUMN_CHUNK_SIZE = 32  # 열 단위 인식 시 한 번에 쌓을 문서 수
+
+    # 병렬 처리 결과 순서
+    ORDER_INPUT = "input"  # 입력 파일 순서
+    ORDER_COMPLETION = "completion"  # 처리 완료 순서
+
+    PIPELINE_QUEUE_SIZE = 4  # 단계 사이 큐 크기 (메모리 상한)
+
+    def __init__(
+        self,
+        file_list: List[str],
+        forced_profile_name: Optional[str] = None,
+        ocr_mode: str = MODE_ROI,
+        workers: int = 0,
+        result_order: str = ORDER_INPUT,
+        pyramid_align: bool = False,
+        roi_warp: bool = False,
+        fast_align_check: bool = False,
+        pdf_clip: bool = False,
+        pdf_text: bool = False,
+        grayscale: bool = False,
+        prefetch_depth: int = 0,
+        prefetch_memory_mb: int = 512,
+        prefetch_align: bool = False,
+        classify_forms: bool = False,
+        resume: bool = False,
+        incremental: bool = False,
+        ocr_cache_disk: bool = False,
+    ):
         super().__init__()
         self.file_list = [Path(f) for f in file_list]
         self.forced_profile_name = forced_profile_name
+        self.ocr_mode = ocr_mode
+        self.workers = workers  # 0이면 순차 처리
+        self.result_order = result_order
+        self.pyramid_align = pyramid_align
+        self.roi_warp = roi_warp  # 전체 페이지 대신 ROI만 원근 변환
+        self.fast_align_check = fast_align_check  # 이미 맞춰진 스캔은 정합 생략
+        self.fast_align_count = 0
+        self.classified_count = 0
+        self.pdf_clip = pdf_clip  # PDF는 저해상도로 정렬 후 ROI만 고해상도 변환
+        self.pdf_text = pdf_text  # PDF 텍스트 레이어가 있으면 OCR 대신 사용
+        self.grayscale = grayscale  # 1채널(흑백)로 디코딩하여 처리
+
+        # 순차 처리 시 다음 파일 미리 읽기 (0이면 사용 안 함)
+        self.prefetch_depth = prefetch_depth
+        self.prefetch_memory_mb = prefetch_memory_mb
+        self.prefetch_align = prefetch_align  # 정렬까지 미리 수행
+
+        # 자동 매칭에서 파일명 키워드가 없으면 페이지 내용으로 서식 분류
+        self.classify_forms = classify_forms
+
+        # 완료된 결과를 저널에 기록, resume=True면 이미 끝난 파일은 건너뜀
+        self.resume = resume
+        self.resumed_count = 0
+        self.journal: Optional[BatchJournal] = None
+        self._profile_versions: Dict[str, str] = {}
+
+        # ROI 단위 결과 저장소: 바뀐 파일/ROI만 다시 인식
+        self.incremental = incremental
+        self.result_store: Optional[ResultStore] = None
+        self._store_keys_cache: Dict[str, tuple] = {}
+        self.reused_roi_count = 0
+        self.ocr_roi_count = 0
+        self.reused_page_count = 0
+
+        # OCR crop 캐시 디스크 단계 사용 여부, 병렬 프로세스에서 받은 OCR 통계
+        self.ocr_cache_disk = ocr_cache_disk
+        self._worker_ocr_stats = dict.fromkeys(OCR_STAT_NAMES, 0)
         self.is_running = True
+        self.processed_count = 0
 
         # 엔진과 매니저 인스턴스 생성
         self.ocr_engine = OCREngine()
         self.profile_manager = ProfileManager()
+        self.image_cache = ImageCache()
 
         # 결과 저장용: { "프로파일이름": [ {row_data}, {row_data} ... ] }
         self.results: Dict[str, List[Dict[str, Any]]] = {}
 
+        # 열 단위 인식 대기열: { (프로파일, 컬럼): [(row_data, crop, dtype), ...] }
+        self._column_queues: Dict[tuple, List[tuple]] = {}
+        # 열 단위 인식 중인 행: { id(row_data): [남은 열 수, 기록용 task 정보] }
+        self._column_rows: Dict[int, list] = {}
+
     def run(self):
         total_files = len(self.file_list)
         self.log_signal.emit(f">>> 작업 시작: 총 {total_files}개 파일")
+        self.log_signal.emit(f">>> OCR 백엔드: {self.ocr_engine.backend.name}")
 
-        processed_count = 0
-
-        # 프로파일 이름 목록 미리 로드
-        profile_names = self.profile_manager.get_all_profile_names()
+        self.processed_count = 0
+        self.ocr_engine.crop_cache.open_disk(self._get_task_options()["ocr_cache"])
+        ocr_stats_start = self.ocr_engine.stats()
 
-        for file_path in self.file_list:
-            if not self.is_running:
-                break
-
-            filename = file_path.name
-            target_profile_name = self._determine_profile(filename, profile_names)
+        # 저널은 이 스레드에서 열고 닫는다 (sqlite 연결은 스레드 간 공유 불가)
+        try:
+            self.journal = BatchJournal()
+        except Exception as e:
+            self.log_signal.emit(f"[WARNING] 작업 기록(저널)을 열 수 없습니다: {e}")
 
-            if not target_profile_name:
-                self.log_signal.emit(f"[SKIP] 매칭 실패: {filename}")
-                processed_count += 1
-                self._emit_progress(processed_count, total_files)
-                continue
+        if self.incremental:
+            try:
+                self.result_store = ResultStore()
+            except Exception as e:
+                self.log_signal.emit(f"[WARNING] 결과 저장소를 열 수 없습니다: {e}")
 
-            self.log_signal.emit(f"[처리 중] {filename} -> {target_profile_name}")
+        try:
+            if self.workers > 0 and self.ocr_mode != self.MODE_COLUMN:
+                self._run_pipeline()
+            else:
+                if self.workers > 0:
+                    self.log_signal.emit(
+                        "[INFO] 열 단위 인식은 병렬 처리를 지원하지 않아 순차 처리합니다."
+                    )
+                self._run_serial()
+            if self.journal and self.is_running:
+                self._forget_journal()
+        finally:
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+            if self.result_store:
+                self.result_store.close()
+                self.result_store = None
+            # 배치마다 새 스레드이므로 이 스레드의 OCR 인스턴스를 남기지 않는다
+            self.ocr_engine.release_thread()
+
+        if self.resume:
+            self.log_signal.emit(
+                f">>> 이어하기: {self.resumed_count}개 파일은 이전 결과 사용"
+            )
 
-            # 프로파일 데이터 로드
-            profile_data = self.profile_manager.get_profile(target_profile_name)
-            row_data = self._process_single_file(file_path, profile_data)
+        if self.incremental:
+            self.log_signal.emit(
+                f">>> 결과 재사용: ROI {self.reused_roi_count}개 재사용 / "
+                f"{self.ocr_roi_count}개 새로 인식 "
+                f"(문서 {self.reused_page_count}개는 인식 없이 완료)"
+            )
 
-            if row_data:
-                if target_profile_name not in self.results:
-                    self.results[target_profile_name] = []
-                self.results[target_profile_name].append(row_data)
+        self._log_ocr_stats(ocr_stats_start)
 
-            processed_count += 1
-            self._emit_progress(processed_count, total_files)
+        if self.fast_align_check:
+            self.log_signal.emit(
+                f">>> 정렬 사전 점검: {self.fast_align_count}개 파일은 특징점 정합 생략"
+            )
 
-            # 너무 빠른 루프 방지 및 UI 반응성 확보
-            time.sleep(0.05)
+        if self._can_classify():
+            self.log_signal.emit(
+                f">>> 서식 분류: {self.classified_count}개 문서는 내용으로 서식 결정"
+            )
 
         if self.results:
             self.results_ready_signal.emit(self.results)
@@ -76,87 +202,677 @@ class BatchProcessor(QThread):
             )
         else:
             self.finished_signal.emit(
-                f"작업이 사용자에 의해 중단되었습니다.(처리됨: {processed_count}/{total_files})"
+                f"작업이 사용자에 의해 중단되었습니다.(처리됨: {self.processed_count}/{total_files})"
             )
 
-    def stop(self):
-        self.is_running = False
+    def _run_serial(self):
+        total_files = len(self.file_list)
 
-    def _determine_profile(
-        self, filename: str, profile_names: List[str]
-    ) -> Optional[str]:
-        if self.forced_profile_name:
-            return self.forced_profile_name
+        jobs = []
+        for file_path in self.file_list:
+            filename = file_path.name
+            target_profile_name = self._determine_profile(filename)
+
+            if self._resume_file(file_path, target_profile_name):
+                continue
 
-        for name in profile_names:
-            profile_data = self.profile_manager.get_profile(name)
-            keywords = profile_data.get("keywords", [])
-            if any(k in filename for k in keywords):
-                return name
-        return None
+            if not target_profile_name:
+                if self._can_classify():
+                    jobs.append((file_path, None, None, []))
+                    continue
+                self.log_signal.emit(f"[SKIP] 매칭 실패: {filename}")
+                self.processed_count += 1
+                continue
 
-    def _process_single_file(
-        self, file_path: Path, profile_data: Dict
-    ) -> Optional[Dict[str, Any]]:
-        try:
             # 프로파일 데이터 로드
-            if not profile_data:
-                return None
+            profile_data = self.profile_manager.get_profile(target_profile_name)
+            # 저장소 연결은 이 스레드 전용이므로 미리 읽기 전에 조회해 둔다
+            cached_tasks = self._cached_page_tasks(
+                file_path, target_profile_name, profile_data
+            )
+            jobs.append((file_path, target_profile_name, profile_data, cached_tasks))
+
+        self._emit_progress(self.processed_count, total_files)
+
+        tasks = self._iter_file_tasks(jobs)
+        if self.prefetch_depth > 0:
+            self.log_signal.emit(
+                f">>> 미리 읽기: {self.prefetch_depth}개 / {self.prefetch_memory_mb}MB"
+            )
+            tasks = PrefetchLoader(
+                tasks,
+                depth=self.prefetch_depth,
+                memory_mb=self.prefetch_memory_mb,
+                prepare=align_stage if self.prefetch_align else None,
+            )
+
+        try:
+            for task in tasks:
+                if not self.is_running:
+                    break
+
+                if task["page"] == 0:
+                    self.log_signal.emit(self._start_message(task))
 
-            rois = profile_data.get("rois", [])
+                row_data = self._process_task(task)
+                if row_data:
+                    self._add_result(task["profile_name"], row_data)
+                    self._record_result(task, row_data)
 
-            # 이미지 로드
-            img = ImageLoader.load_image(str(file_path))
-            if img is None:
-                self.log_signal.emit(f"[ERROR] 이미지 로드 실패: {file_path.name}")
-                return None
+                # 여러 페이지 파일은 페이지 단위로 진행률 갱신
+                done = self.processed_count + (task["page"] + 1) / task["page_count"]
+                self._emit_progress(done, total_files)
 
-            # 템플릿 로드
-            template_path = profile_data.get("template_path", "")
-            if template_path and Path(template_path).exists():
-                template_img = ImageLoader.load_image(template_path)
+                if task["page"] + 1 == task["page_count"]:
+                    self.processed_count += 1
 
-                if template_img is not None:
-                    aligned_image, h_matrix = ImageAligner.align_images(
-                        img, template_img
+                    # 너무 빠른 루프 방지 및 UI 반응성 확보
+                    time.sleep(0.05)
+
+        finally:
+            tasks.close()
+
+        # 열 단위 인식: 청크를 채우지 못하고 남은 ROI 처리
+        self._flush_column_queues()
+
+    def _run_pipeline(self):
+        total_files = len(self.file_list)
+
+        # 프로파일 매칭은 파일명만 보므로 미리 끝내 둔다
+        # 여러 페이지 파일은 페이지마다 별도 작업으로 나눈다
+        tasks = []
+        remaining_pages: Dict[str, int] = {}
+        for file_path in self.file_list:
+            target_profile_name = self._determine_profile(file_path.name)
+            if self._resume_file(file_path, target_profile_name):
+                continue
+
+            profile_data = (
+                self.profile_manager.get_profile(target_profile_name)
+                if target_profile_name
+                else None
+            )
+
+            if not profile_data and not self._can_classify():
+                self.log_signal.emit(f"[SKIP] 매칭 실패: {file_path.name}")
+                self.processed_count += 1
+                continue
+
+            page_count = ImageLoader.count_pages(file_path)
+            remaining_pages[str(file_path)] = page_count
+            for page in range(page_count):
+                tasks.append(
+                    make_task(
+                        len(tasks),
+                        file_path,
+                        target_profile_name,
+                        profile_data,
+                        page_mode=self.ocr_mode == self.MODE_PAGE,
+                        options=self._get_task_options(profile_data is None),
+                        page=page,
+                        page_count=page_count,
                     )
+                )
+                # 모든 ROI를 재사용하는 페이지는 각 단계를 그대로 통과
+                self._attach_cached(tasks[-1])
+
+        skipped = self.processed_count
+        self._emit_progress(self.processed_count, total_files)
+        if not tasks:
+            return
+
+        load_n, align_n, ocr_n = StagedPipeline.split_workers(self.workers)
+        self.log_signal.emit(
+            f">>> 병렬 처리: 로드 {load_n} / 정렬 {align_n} / OCR {ocr_n} 프로세스"
+        )
+
+        pipeline = StagedPipeline(
+            [(load_stage, load_n), (align_stage, align_n), (ocr_stage, ocr_n)],
+            queue_size=self.PIPELINE_QUEUE_SIZE,
+        )
+        pipeline.start()
+
+        # 입력 큐가 가득 차면 대기해야 하므로 투입은 별도 스레드에서 수행
+        feeder = threading.Thread(
+            target=self._feed_pipeline, args=(pipeline, tasks), daemon=True
+        )
+        feeder.start()
+
+        pending: Dict[int, Dict[str, Any]] = {}
+        received_indices = set()
+        next_index = 0
+        received = 0
+        failed = False
+
+        try:
+            while received < len(tasks) and self.is_running:
+                task = pipeline.get(timeout=0.2)
+                if task is None:
+                    # 작업 프로세스가 죽으면 남은 결과는 오지 않으므로 실패 처리
+                    exit_codes = pipeline.dead_workers()
+                    if exit_codes:
+                        failed = True
+                        self._fail_outstanding(
+                            tasks[next_index:],
+                            received_indices,
+                            pending,
+                            remaining_pages,
+                            exit_codes,
+                        )
+                        break
+                    continue
+
+                received += 1
+                received_indices.add(task["index"])
+                if self.result_order == self.ORDER_COMPLETION:
+                    self._collect_task(task)
+                else:
+                    # 입력 순서 유지: 앞 번호가 도착할 때까지 보류
+                    pending[task["index"]] = task
+                    while next_index in pending:
+                        self._collect_task(pending.pop(next_index))
+                        next_index += 1
+
+                # 파일의 마지막 페이지까지 받으면 파일 처리 완료
+                remaining_pages[task["path"]] -= 1
+                if remaining_pages[task["path"]] == 0:
+                    self.processed_count += 1
+                self._emit_progress(skipped + received, skipped + len(tasks))
+        finally:
+            if self.is_running and not failed:
+                pipeline.close()
+            else:
+                pipeline.terminate()
+            feeder.join(1.0)
+
+    def _fail_outstanding(
+        self,
+        tasks: List[Dict[str, Any]],
+        received_indices: set,
+        pending: Dict[int, Dict[str, Any]],
+        remaining_pages: Dict[str, int],
+        exit_codes: List[Optional[int]],
+    ):
+        # 받은 결과는 순서대로 마저 수집하고, 받지 못한 작업은 오류로 기록
+        for task in tasks:
+            if task["index"] in pending:
+                self._collect_task(pending.pop(task["index"]))
+                continue
+            if task["index"] in received_indices:
+                continue
+
+            self.log_signal.emit(
+                f"[ERROR] {document_name(task)} 처리 중 오류: "
+                f"작업 프로세스가 비정상 종료되었습니다 (종료 코드 {exit_codes})"
+            )
+            remaining_pages[task["path"]] -= 1
+            if remaining_pages[task["path"]] == 0:
+                self.processed_count += 1
+
+    def _feed_pipeline(self, pipeline: StagedPipeline, tasks: List[Dict[str, Any]]):
+        for task in tasks:
+            if task["page"] == 0:
+                self.log_signal.emit(self._start_message(task))
+            while not pipeline.put(task, timeout=0.2):
+                if not self.is_running or pipeline.closed:
+                    return
+            if not self.is_running:
+                return
+
+    def _start_message(self, task: Dict[str, Any]) -> str:
+        name = Path(task["path"]).name
+        if task["page_count"] > 1:
+            name += f" ({task['page_count']}페이지)"
+        profile_name = task["profile_name"] or "(내용으로 분류)"
+        return f"[처리 중] {name} -> {profile_name}"
+
+    def _can_classify(self) -> bool:
+        return self.classify_forms and not self.forced_profile_name
+
+    def _get_task_options(self, classify: bool = False) -> Dict[str, Any]:
+        if classify:
+            # 서식 미정 task: 분류 후보 서식을 함께 넘김 (프로세스 파이프라인 포함)
+            return {
+                **self._get_task_options(),
+                "classify_profiles": self.profile_manager.profiles,
+            }
+
+        return {
+            "pyramid": self.pyramid_align,
+            "roi_warp": self.roi_warp,
+            "fast_check": self.fast_align_check,
+            "pdf_clip": self.pdf_clip,
+            "pdf_text": self.pdf_text,
+            "grayscale": self.grayscale,
+            "ocr_cache": AppConfig.OCR_CACHE_PATH if self.ocr_cache_disk else None,
+        }
+
+    def _log_source(self, task: Dict[str, Any]):
+        # PDF 처리 경로 표시 (텍스트 레이어 / 이미지 변환)
+        name = document_name(task)
+        if not self.pdf_text or not task["path"].lower().endswith(".pdf"):
+            return
+
+        if task["pdf_words"] is not None:
+            self.log_signal.emit(f"  [PDF 텍스트] {name}: 내장 텍스트 사용 (OCR 생략)")
+        else:
+            self.log_signal.emit(
+                f"  [PDF 이미지] {name}: 텍스트 레이어 없음, 이미지 변환 후 OCR"
+            )
+
+    def _remember_alignment(self, task: Dict[str, Any]):
+        # 검증 화면에서 같은 파일을 다시 정합하지 않도록 행렬을 공유 캐시에 기록
+        matrix = full_resolution_matrix(task)
+        if matrix is None:
+            return
+
+        profile_data = task["profile_data"]
+        self.image_cache.put_matrix(
+            task["path"],
+            profile_data.get("template_path", ""),
+            ImageAligner.get_profile_settings(profile_data),
+            matrix,
+            task["align"]["template_shape"],
+            page=task["page"],
+        )
+
+    def _log_classify(self, task: Dict[str, Any]):
+        info = task["classify"]
+        if not info:
+            return
+
+        self.classified_count += 1
+        self.log_signal.emit(
+            f"  [서식 분류] {document_name(task)} -> {task['profile_name']} "
+            f"(득표 {info['votes']} / 2위 {info['runner_up_votes']})"
+        )
+
+    def _log_align(self, task: Dict[str, Any]):
+        info = task["align"]
+        if not info:
+            return
+
+        name = document_name(task)
+        if info["method"] == "fast":
+            self.fast_align_count += 1
+
+        if info["ok"]:
+            self.log_signal.emit(
+                f"  [정렬] {name}: {info['method']} {info['elapsed']:.2f}초, "
+                f"인라이어 {info['inlier_ratio']:.0%}"
+            )
+        else:
+            self.log_signal.emit(f"  [정렬 실패] {name}: 원본 이미지로 진행")
+
+    def _collect_task(self, task: Dict[str, Any]):
+        # 병렬 OCR 프로세스의 통계 합산
+        for name, value in (task["ocr_stats"] or {}).items():
+            self._worker_ocr_stats[name] += value
+
+        self._log_classify(task)
+        self._log_source(task)
+        self._log_align(task)
+        self._remember_alignment(task)
+        if task["error"]:
+            self.log_signal.emit(task["error"])
+            return
+
+        if task["row_data"]:
+            self._add_result(task["profile_name"], task["row_data"])
+            self._record_result(task, task["row_data"])
+
+    def _log_ocr_stats(self, start: Dict[str, float]):
+        # 이 스레드(순차/열 단위)와 병렬 프로세스의 통계를 합쳐 표시
+        end = self.ocr_engine.stats()
+        hits, misses, saved, blank, escalated = (
+            end[name] - start[name] + self._worker_ocr_stats[name]
+            for name in OCR_STAT_NAMES
+        )
+        if blank:
+            self.log_signal.emit(f">>> 빈 칸 판정: {blank}개 영역은 OCR 생략")
+        if escalated:
+            self.log_signal.emit(
+                f">>> 신뢰도 낮음: {escalated}개 영역은 정밀 전처리로 다시 인식"
+            )
+        if hits + misses:
+            self.log_signal.emit(
+                f">>> OCR 캐시: {hits}/{hits + misses}개 crop 적중 "
+                f"({hits / (hits + misses):.0%}), 약 {saved:.1f}초 절약"
+            )
+
+    def _add_result(self, profile_name: str, row_data: Dict[str, Any]):
+        if profile_name not in self.results:
+            self.results[profile_name] = []
+        self.results[profile_name].append(row_data)
+
+    def _profile_version(self, profile_name: str) -> str:
+        if profile_name not in self._profile_versions:
+            self._profile_versions[profile_name] = ProfileManager.profile_version(
+                self.profile_manager.get_profile(profile_name)
+            )
+        return self._profile_versions[profile_name]
+
+    def _record_result(self, task: Dict[str, Any], row_data: Dict[str, Any]):
+        # 열 단위 인식 중인 행은 모든 열이 채워진 뒤 기록
+        if id(row_data) in self._column_rows:
+            return
+
+        if self.result_store:
+            try:
+                self._store_result(task, row_data)
+            except Exception as e:
+                self.log_signal.emit(f"[WARNING] 결과 저장 실패: {e}")
+
+        if not self.journal:
+            return
+
+        try:
+            self.journal.record(
+                task["path"],
+                task["page"],
+                task["page_count"],
+                row_data.get("file_stamp", ""),
+                task["profile_name"],
+                self._profile_version(task["profile_name"]),
+                row_data,
+            )
+        except Exception as e:
+            self.log_signal.emit(f"[WARNING] 작업 기록 실패: {e}")
+
+    def _forget_journal(self):
+        # 중지 없이 끝난 배치는 이어할 것이 없으므로 이 배치 파일들의 기록을 지운다
+        try:
+            self.journal.forget([str(file_path) for file_path in self.file_list])
+        except Exception as e:
+            self.log_signal.emit(f"[WARNING] 작업 기록 정리 실패: {e}")
+
+    def _resume_file(self, file_path: Path, profile_name: Optional[str]) -> bool:
+        """저널에 같은 파일/서식 버전의 결과가 모두 있으면 결과에 추가하고 True"""
+        if not self.resume or not self.journal:
+            return False
+
+        rows = self.journal.completed_rows(
+            str(file_path), ImageCache.file_stamp(file_path)
+        )
+        if not rows:
+            return False
+
+        for name, version, _ in rows:
+            # 파일명으로 정해진 서식이 바뀌었거나 서식 설정이 바뀌었으면 다시 처리
+            if profile_name and name != profile_name:
+                return False
+            if name not in self.profile_manager.profiles:
+                return False
+            if version != self._profile_version(name):
+                return False
+
+        for name, _, row_data in rows:
+            self._add_result(name, row_data)
+
+        self.log_signal.emit(f"[이어하기] {file_path.name}: 이전 결과 사용")
+        self.resumed_count += 1
+        self.processed_count += 1
+        return True
+
+    def stop(self):
+        self.is_running = False
+
+    def _determine_profile(self, filename: str) -> Optional[str]:
+        if self.forced_profile_name:
+            return self.forced_profile_name
 
-                    if h_matrix is not None:
-                        img = aligned_image
+        # 키워드 자동자는 배치마다 한 번만 구성됨 (ProfileManager.resolve_profile)
+        return self.profile_manager.resolve_profile(filename)
 
-            curr_h, curr_w = img.shape[:2]
+    def _iter_file_tasks(self, jobs: List[tuple]):
+        # 파일을 페이지 단위 task로 펼친다 (한 번에 한 페이지만 메모리에 유지)
+        # 미리 읽기 스레드에서 실행될 수 있으므로 저장소는 여기서 조회하지 않는다
+        for file_path, profile_name, profile_data, cached_tasks in jobs:
+            # 모든 페이지를 이전 결과로 채울 수 있으면 파일을 읽지 않음
+            if cached_tasks and all(t["reused"] for t in cached_tasks):
+                yield from cached_tasks
+                continue
 
-            row_data = {
-                "파일명": file_path.name,
-                "full_path": str(file_path),
+            try:
+                for task in iter_page_tasks(
+                    0,
+                    file_path,
+                    profile_name,
+                    profile_data,
+                    page_mode=self.ocr_mode == self.MODE_PAGE,
+                    options=self._get_task_options(profile_data is None),
+                ):
+                    if task["page"] < len(cached_tasks):
+                        cached = cached_tasks[task["page"]]
+                        for key in (
+                            "cached",
+                            "cached_confidence",
+                            "reused",
+                            "row_data",
+                        ):
+                            task[key] = cached[key]
+                    yield task
+            except Exception as e:
+                task = make_task(0, file_path, profile_name, profile_data)
+                task["error"] = f"[ERROR] {file_path.name} 처리 중 오류: {e}"
+                yield task
+
+    def _cached_page_tasks(
+        self, file_path: Path, profile_name: Optional[str], profile_data
+    ) -> List[Dict[str, Any]]:
+        # 페이지별 task를 만들어 저장소의 이전 결과를 붙인다 (저장소를 쓰지 않으면 빈 목록)
+        if not self.result_store or not profile_name:
+            return []
+
+        page_count = ImageLoader.count_pages(file_path)
+        tasks = []
+        for page in range(page_count):
+            task = make_task(
+                0,
+                file_path,
+                profile_name,
+                profile_data,
+                page_mode=self.ocr_mode == self.MODE_PAGE,
+                options=self._get_task_options(),
+                page=page,
+                page_count=page_count,
+            )
+            self._attach_cached(task)
+            tasks.append(task)
+        return tasks
+
+    def _store_keys(self, profile_name: str) -> tuple:
+        """(처리 조건 키, {컬럼 이름: ROI 키}) - 서식별로 한 번만 계산"""
+        if profile_name not in self._store_keys_cache:
+            profile_data = self.profile_manager.get_profile(profile_name) or {}
+            # crop 캐시 사용 여부는 인식 결과와 무관
+            options = {
+                **self._get_task_options(),
+                "ocr_cache": None,
+                "ocr_mode": self.ocr_mode,
+                "backend": self.ocr_engine.backend.name,
             }
+            context_key = ResultStore.context_key(
+                ProfileManager.profile_version({**profile_data, "rois": []}),
+                options,
+            )
+            self._store_keys_cache[profile_name] = (
+                context_key,
+                ResultStore.roi_keys(context_key, profile_data.get("rois", [])),
+            )
+        return self._store_keys_cache[profile_name]
 
-            for roi in rois:
-                # 중지 요청 시 즉시 중단 (긴 작업 방지)
-                if not self.is_running:
-                    return None
+    def _attach_cached(self, task: Dict[str, Any]):
+        # 저장소에서 이전 결과를 찾는다 (모든 ROI와 정렬 정보가 있으면 행을 바로 완성)
+        if not self.result_store or not task["profile_name"]:
+            return
 
-                # 좌표 계산
-                final_x = int(roi["x"] * curr_w)
-                final_y = int(roi["y"] * curr_h)
-                final_w = int(roi["w"] * curr_w)
-                final_h = int(roi["h"] * curr_h)
+        try:
+            context_key, roi_keys = self._store_keys(task["profile_name"])
+            content_hash = self.result_store.content_hash(
+                task["path"], ImageCache.file_stamp(task["path"])
+            )
+            texts, meta = self.result_store.lookup(
+                content_hash, task["page"], context_key, roi_keys
+            )
+        except Exception as e:
+            self.log_signal.emit(f"[WARNING] 결과 저장소 조회 실패: {e}")
+            return
+
+        task["cached"] = texts
+        if meta is not None:
+            # 이전 실행의 신뢰도 중 재사용하는 ROI 것만
+            try:
+                confidences = json.loads(meta.pop("ocr_confidence", "") or "{}")
+            except ValueError:
+                confidences = {}
+            task["cached_confidence"] = {
+                col_name: value
+                for col_name, value in confidences.items()
+                if col_name in texts
+            }
 
-                col_name = roi["col_name"]
-                dtype = roi.get("dtype", "전체")
+        if meta is not None and len(texts) == len(roi_keys):
+            row_data = make_row_data(task)
+            row_data.update(meta)
+            task["row_data"] = row_data
+            task["reused"] = True
+
+    def _store_result(self, task: Dict[str, Any], row_data: Dict[str, Any]):
+        # 새로 인식한 ROI와 정렬 정보를 저장소에 기록
+        context_key, roi_keys = self._store_keys(task["profile_name"])
+        cached = task.get("cached") or {}
+        self.reused_roi_count += len(cached)
+        self.ocr_roi_count += len(roi_keys) - len(cached)
+
+        if task.get("reused"):
+            self.reused_page_count += 1
+            return
+
+        content_hash = self.result_store.content_hash(
+            task["path"], row_data.get("file_stamp", "")
+        )
+        new_keys = {
+            col_name: key
+            for col_name, key in roi_keys.items()
+            if col_name not in cached
+        }
+        self.result_store.record(
+            content_hash, task["page"], context_key, new_keys, row_data
+        )
+
+    def _process_task(self, task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # 로드가 끝난 task를 정렬 -> OCR (열 단위 모드는 대기열에 추가)
+        if task["error"]:
+            self.log_signal.emit(task["error"])
+            return None
 
-                # OCR 엔진 호출
-                text = self.ocr_engine.extract_text_from_roi(
-                    img, final_x, final_y, final_w, final_h, dtype=dtype
-                )
-                row_data[col_name] = text
+        # 모든 ROI를 이전 결과로 채운 task
+        if task["row_data"] is not None:
+            return task["row_data"]
 
-            return row_data
+        try:
+            # 미리 읽기 단계에서 정렬을 끝낸 task는 그대로 사용
+            if task["align"] is None:
+                task = align_stage(task)
+            self._log_classify(task)
+            self._log_source(task)
+            self._log_align(task)
+            self._remember_alignment(task)
+
+            if self.ocr_mode == self.MODE_COLUMN and task["pdf_words"] is None:
+                row_data = make_row_data(task)
+                self._queue_column_crops(task, get_roi_crops(task), row_data)
+                return row_data
+
+            task = ocr_stage(task, should_stop=lambda: not self.is_running)
+            return task["row_data"]
+
+        except StageError as e:
+            self.log_signal.emit(str(e))
+            return None
 
         except Exception as e:
-            self.log_signal.emit(f"[ERROR] {file_path.name} 처리 중 오류: {e}")
+            self.log_signal.emit(f"[ERROR] {document_name(task)} 처리 중 오류: {e}")
             return None
 
+    def _queue_column_crops(
+        self, task: Dict[str, Any], roi_crops: List[tuple], row_data: Dict
+    ):
+        profile_name = task["profile_name"]
+        if roi_crops:
+            # 페이지 이미지를 붙잡지 않도록 기록에 필요한 값만 보관
+            meta = {
+                key: task[key]
+                for key in ("path", "page", "page_count", "profile_name", "cached")
+            }
+            self._column_rows[id(row_data)] = [len(roi_crops), meta]
+
+        for col_name, crop, dtype in roi_crops:
+            # 값은 청크 인식 후 채워짐 (컬럼 순서 유지를 위해 자리만 잡아둠)
+            row_data[col_name] = ""
+
+            key = (profile_name, col_name)
+            queue = self._column_queues.setdefault(key, [])
+            # 원본 페이지 참조가 남지 않도록 복사
+            queue.append((row_data, crop.copy(), dtype))
+
+            if len(queue) >= self.COLUMN_CHUNK_SIZE:
+                self._flush_column_queue(key)
+
+    def _flush_column_queues(self):
+        if not self.is_running:
+            # 중지: 남은 청크는 인식하지 않고 버린다 (미완성 행은 저널에 기록하지 않음)
+            if self._column_rows:
+                self.log_signal.emit(
+                    f"[INFO] 중지되어 열 단위 인식 대기 중인 문서 "
+                    f"{len(self._column_rows)}개는 인식하지 않았습니다."
+                )
+            self._column_queues.clear()
+            self._column_rows.clear()
+            return
+
+        for key in list(self._column_queues.keys()):
+            self._flush_column_queue(key)
+
+    def _flush_column_queue(self, key: tuple):
+        queue = self._column_queues.pop(key, [])
+        if not queue:
+            return
+
+        profile_name, col_name = key
+        dtype = queue[0][2]
+        profile_data = self.profile_manager.get_profile(profile_name)
+
+        try:
+            # 빈 칸은 합성에서 빠지고, 신뢰도가 낮은 칸만 따로 다시 인식
+            results = self.ocr_engine.recognize_crops(
+                [crop for _, crop, _ in queue],
+                dtype,
+                profile_data,
+                col_name in self.ocr_engine.line_removal_rois(profile_data),
+            )
+        except Exception as e:
+            self.log_signal.emit(f"[ERROR] '{col_name}' 열 인식 중 오류: {e}")
+            results = None
+
+        for i, (row_data, _, _) in enumerate(queue):
+            if results is not None:
+                row_data[col_name] = results[i].text
+                set_confidences(row_data, {col_name: results[i]})
+            self._column_row_done(row_data)
+
+    def _column_row_done(self, row_data: Dict[str, Any]):
+        # 행의 마지막 열까지 인식되면 저널에 기록
+        pending = self._column_rows.get(id(row_data))
+        if pending is None:
+            return
+
+        pending[0] -= 1
+        if pending[0] <= 0:
+            del self._column_rows[id(row_data)]
+            self._record_result(pending[1], row_data)
+
     def _emit_progress(self, current: int, total: int):
         if total > 0:
             percent = int((current / total) * 100)
@@ -7,10 +7,27 @@ class AppConfig:
     APP_NAME: Final[str] = "Gunsan OCR Program"
 
     # ext
-    IMG_EXTS: Final[Tuple[str, ...]] = (".png", ".jpg", ".jpeg", ".pdf")
+    IMG_EXTS: Final[Tuple[str, ...]] = (
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".pdf",
+        ".tif",
+        ".tiff",
+    )
     EXCEL_EXTS: Final[Tuple[str, ...]] = (".xlsx", ".xls")
     JSON_EXTS: Final[Tuple[str, ...]] = (".json",)
 
+    # 템플릿 특징점 캐시 폴더 (profiles.json과 같은 위치)
+    TEMPLATE_CACHE_DIR: Final[str] = "template_cache"
+
+    # 배치 결과 저널 (중단된 작업 이어하기용, profiles.json과 같은 위치)
+    JOURNAL_PATH: Final[str] = "batch_journal.db"
+    # ROI 단위 인식 결과 저장소 (바뀐 파일/ROI만 다시 인식)
+    RESULT_STORE_PATH: Final[str] = "result_store.db"
+    # 전처리한 ROI 이미지별 인식 결과 (OCR crop 캐시의 디스크 단계)
+    OCR_CACHE_PATH: Final[str] = "ocr_cache.db"
+
     @staticmethod
     def _make_filter(name: str, exts: Tuple[str, ...]):
         # 예: (".png", ".jpg") -> "*.png *.jpg"
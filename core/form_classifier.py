@@ -0,0 +1,163 @@
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.image_aligner import ImageAligner
+
+
+@dataclass
+class ClassifyResult:
+    profile_name: str
+    score: float  # 1위 서식 득표 / 대상 특징점 수
+    votes: int
+    runner_up_votes: int
+    # 1위 서식과의 매칭 (대상 좌표(원본 해상도), 템플릿 특징점 인덱스) -> ImageAligner.align(matches=)
+    matches: Optional[Tuple[np.ndarray, np.ndarray]] = field(default=None, repr=False)
+
+
+class FormClassifier:
+    """
+    페이지 이미지만으로 서식을 고른다 (파일명에 키워드가 없는 경우).
+    모든 서식 템플릿의 ORB 기술자를 하나의 LSH 색인으로 묶어 두고,
+    대상 기술자를 한 번만 검색하여 가장 많은 표를 받은 템플릿을 고른다.
+    (템플릿마다 정렬을 시도하지 않음 / 1위 매칭은 정렬에 그대로 재사용)
+    """
+
+    _instance = None
+
+    MAX_SIDE = ImageAligner.PYRAMID_MAX_SIDE  # 피라미드 정렬과 같은 축소 특징점 사용
+    MIN_VOTES = 15  # 1위 서식의 최소 득표 수
+    MIN_MARGIN = 1.5  # 1위 득표가 2위 득표의 몇 배 이상이어야 하는지
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(FormClassifier, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, "_initialized", False):
+            return
+
+        self._lock = threading.Lock()
+        self._index_key = None
+        self._index = None
+        self._names: List[str] = []  # 템플릿 번호 -> 서식 이름
+        self._labels = np.zeros(0, dtype=np.int32)  # 기술자 -> 템플릿 번호
+        self._offsets = np.zeros(0, dtype=np.int64)  # 템플릿 번호 -> 첫 기술자 위치
+
+        self._initialized = True
+
+    @staticmethod
+    def _templates(profiles: Dict[str, Dict]) -> List[Tuple[str, str, int]]:
+        # (서식 이름, 템플릿 경로, 특징점 수) - 같은 템플릿은 목록에서 앞선 서식만
+        templates = []
+        seen = set()
+        for name, profile_data in profiles.items():
+            template_path = (profile_data or {}).get("template_path", "")
+            if not template_path or not Path(template_path).exists():
+                continue
+
+            max_features = ImageAligner.get_profile_settings(profile_data)[
+                "max_features"
+            ]
+            key = (str(Path(template_path).resolve()), max_features)
+            if key in seen:
+                continue
+            seen.add(key)
+            templates.append((name, template_path, max_features))
+        return templates
+
+    def _ensure_index(self, profiles: Dict[str, Dict]) -> bool:
+        templates = self._templates(profiles)
+        index_key = tuple(
+            (name, ImageAligner.template_hash(path), max_features)
+            for name, path, max_features in templates
+        )
+        if index_key == self._index_key:
+            return self._index is not None
+
+        names, descriptors, labels = [], [], []
+        for name, template_path, max_features in templates:
+            features = ImageAligner.get_template_features(
+                template_path, self.MAX_SIDE, max_features
+            )
+            if features is None or len(features.descriptors) == 0:
+                continue
+
+            labels.append(np.full(len(features.descriptors), len(names), np.int32))
+            descriptors.append(features.descriptors)
+            names.append(name)
+
+        self._index_key = index_key
+        self._names = names
+        if not descriptors:
+            self._index = None
+            return False
+
+        counts = [len(d) for d in descriptors]
+        self._labels = np.concatenate(labels)
+        self._offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        self._index = cv2.flann_Index(
+            np.vstack(descriptors), ImageAligner.FLANN_LSH_PARAMS
+        )
+        return True
+
+    def classify(
+        self, image: np.ndarray, profiles: Dict[str, Dict]
+    ) -> Optional[ClassifyResult]:
+        """
+        profiles : {서식 이름: 서식 데이터} - 템플릿이 있는 서식만 후보
+        반환값 : 1위 서식 (득표가 부족하거나 2위와 차이가 작으면 None)
+        """
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        scale = min(1.0, self.MAX_SIDE / max(gray.shape[:2]))
+        if scale < 1.0:
+            gray = cv2.resize(
+                gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+            )
+
+        orb = cv2.ORB_create(ImageAligner.MAX_FEATURES)
+        keypoints, descriptors = orb.detectAndCompute(gray, None)
+        if descriptors is None or len(descriptors) < 2:
+            return None
+
+        with self._lock:
+            if not self._ensure_index(profiles):
+                return None
+            train_idx, distances = self._index.knnSearch(descriptors, 2, params={})
+            labels = self._labels
+            offsets = self._offsets
+            names = list(self._names)
+
+        # 비율 검사를 통과한 매칭만 해당 템플릿에 투표
+        valid = (train_idx >= 0).all(axis=1) & (
+            distances[:, 0] < distances[:, 1] * ImageAligner.RATIO_TEST
+        )
+        query_idx = np.flatnonzero(valid)
+        voted = labels[train_idx[query_idx, 0]]
+        votes = np.bincount(voted, minlength=len(names))
+
+        ranking = np.argsort(-votes, kind="stable")
+        winner = int(ranking[0])
+        runner_up = int(votes[ranking[1]]) if len(names) > 1 else 0
+        if votes[winner] < self.MIN_VOTES:
+            return None
+        if votes[winner] < runner_up * self.MIN_MARGIN:
+            return None
+
+        picked = query_idx[voted == winner]
+        target_points = cv2.KeyPoint_convert(keypoints).reshape(-1, 2)[picked] / scale
+        template_idx = train_idx[picked, 0] - offsets[winner]
+
+        return ClassifyResult(
+            profile_name=names[winner],
+            score=float(votes[winner] / len(descriptors)),
+            votes=int(votes[winner]),
+            runner_up_votes=runner_up,
+            matches=(target_points.astype(np.float32), template_idx.astype(int)),
+        )
@@ -1,12 +1,629 @@
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
 import cv2
 import numpy as np
 
+from core.constants import AppConfig
+from core.image_loader import ImageLoader
+
+
+@dataclass
+class TemplateFeatures:
+    points: np.ndarray  # 특징점 좌표 (N, 2) float32
+    descriptors: np.ndarray  # ORB 기술자 (N, 32) uint8
+    shape: Tuple[int, int]  # 템플릿 원본 크기 (h, w)
+    scale: float = 1.0  # 특징점 검출 시 축소 비율 (points는 축소 좌표)
+    matcher: Any = field(default=None, repr=False)  # 템플릿 기술자를 학습한 matcher
+    flann_index: Any = field(default=None, repr=False)  # LSH 색인 (필요할 때 생성)
+
+
+@dataclass
+class AlignResult:
+    image: Optional[np.ndarray]  # 정렬된 이미지 (실패 시 원본)
+    matrix: Optional[np.ndarray] = None  # 대상 -> 템플릿 호모그래피 (원본 해상도)
+    inlier_ratio: float = 0.0  # RANSAC 인라이어 비율
+    residual: float = 0.0  # 인라이어 평균 재투영 오차 (px, 원본 해상도)
+    elapsed: float = 0.0  # 정렬 소요 시간 (초)
+    method: str = ""  # "orb", "pyramid", "pyramid+ecc"
+    template_shape: Optional[Tuple[int, int]] = None  # 정렬 기준 크기 (h, w)
+
+    @property
+    def ok(self) -> bool:
+        return self.matrix is not None
+
 
 # Template Matching / Document Registration
 class ImageAligner:
     MAX_FEATURES = 2000
     GOOD_MATCH_PERCENT = 0.15
 
+    # 특징점 매칭 방식 (프로파일의 align_settings로 서식별 지정 가능)
+    MATCHER_BF = "bf"  # 교차 검증 + 거리순 상위 N% (기존 방식)
+    MATCHER_RATIO = "ratio"  # 전수 knn(k=2) + 비율 검사
+    MATCHER_FLANN = "flann"  # 템플릿 LSH 색인 knn(k=2) + 비율 검사
+    DEFAULT_MATCHER = MATCHER_BF
+    RATIO_TEST = 0.75  # 1순위 거리 < 2순위 거리 * RATIO_TEST 인 매칭만 사용
+    FLANN_LSH_PARAMS = {
+        "algorithm": 6,  # FLANN_INDEX_LSH
+        "table_number": 6,
+        "key_size": 12,
+        "multi_probe_level": 1,
+    }
+
+    # 피라미드 정렬: 축소본에서 추정 후 행렬을 원본 해상도로 환산
+    PYRAMID_MAX_SIDE = 1200  # 축소본의 긴 변 길이(px)
+    REFINE_RESIDUAL_PX = 3.0  # 재투영 오차가 이보다 크면 ECC 보정
+    REFINE_MAX_SIDE = 2400  # ECC 보정 해상도
+    REFINE_ITERATIONS = 50
+
+    ROI_WARP_MARGIN = 8  # ROI 단위 변환 시 보간용 여백(px)
+
+    # 정렬 사전 점검: 이미 맞춰진 스캔이면 ORB 정합 생략
+    FAST_CHECK_MAX_SIDE = 1024  # 위상 상관 계산 해상도
+    FAST_CHECK_MIN_RESPONSE = 0.1  # 위상 상관 최소 신뢰도
+    FAST_CHECK_TOLERANCE_PX = 2.0  # 허용 잔차 (템플릿 원본 px)
+
+    # 템플릿 특징점 캐시 (메모리 + profiles.json 옆 .npz)
+    cache_dir = Path(AppConfig.TEMPLATE_CACHE_DIR)
+    _feature_cache: Dict[str, TemplateFeatures] = {}
+    _hash_cache: Dict[Tuple[str, int, int], str] = {}
+    _gray_cache: Dict[str, np.ndarray] = {}
+    _cache_lock = threading.Lock()
+
+    @staticmethod
+    def _to_gray(img):
+        if len(img.shape) == 3:
+            return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        return img
+
+    @classmethod
+    def template_hash(cls, template_path: Union[str, Path]) -> str:
+        # 파일 내용 해시 (경로/수정시각/크기가 같으면 다시 읽지 않음)
+        path_obj = Path(template_path).resolve()
+        stat = path_obj.stat()
+        stat_key = (str(path_obj), stat.st_mtime_ns, stat.st_size)
+
+        file_hash = cls._hash_cache.get(stat_key)
+        if file_hash is None:
+            file_hash = hashlib.sha1(path_obj.read_bytes()).hexdigest()
+            cls._hash_cache[stat_key] = file_hash
+        return file_hash
+
+    @classmethod
+    def get_profile_settings(cls, profile_data: Optional[Dict]) -> Dict[str, Any]:
+        """프로파일의 정렬 설정 (없는 값은 기본값) -> align()의 키워드 인자"""
+        settings = (profile_data or {}).get("align_settings") or {}
+        return {
+            "max_features": int(settings.get("max_features", cls.MAX_FEATURES)),
+            "good_match_percent": float(
+                settings.get("good_match_percent", cls.GOOD_MATCH_PERCENT)
+            ),
+            "matcher": settings.get("matcher", cls.DEFAULT_MATCHER),
+        }
+
+    @classmethod
+    def get_template_features(
+        cls,
+        template_path: Union[str, Path],
+        max_side: int = 0,
+        max_features: Optional[int] = None,
+    ) -> Optional[TemplateFeatures]:
+        """max_side > 0 이면 긴 변을 max_side로 축소한 템플릿에서 특징점 검출"""
+        path_obj = Path(template_path)
+        if not path_obj.exists():
+            return None
+
+        max_features = max_features or cls.MAX_FEATURES
+        path_key = hashlib.sha1(str(path_obj.resolve()).encode("utf-8")).hexdigest()
+        cache_key = (
+            f"{path_key[:12]}_{cls.template_hash(path_obj)[:16]}"
+            f"_{max_features}_{max_side}"
+        )
+
+        with cls._cache_lock:
+            features = cls._feature_cache.get(cache_key)
+            if features is not None:
+                return features
+
+            features = cls._load_features(cache_key)
+            if features is None:
+                template_img = ImageLoader.load_image(path_obj)
+                if template_img is None:
+                    return None
+
+                template_gray = cls._to_gray(template_img)
+                scale = cls._get_scale(template_gray, max_side)
+                features = cls._compute_features(
+                    cls._resize(template_gray, scale),
+                    template_gray.shape[:2],
+                    scale,
+                    max_features,
+                )
+                cls._save_features(cache_key, path_key[:12], features)
+
+            # 템플릿 기술자를 미리 학습시켜 두고 파일마다 재사용
+            features.matcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
+            features.matcher.add([features.descriptors])
+            features.matcher.train()
+
+            cls._feature_cache[cache_key] = features
+            return features
+
+    @staticmethod
+    def _get_scale(img, max_side: int) -> float:
+        if max_side <= 0:
+            return 1.0
+        return min(1.0, max_side / max(img.shape[:2]))
+
+    @staticmethod
+    def _resize(img, scale: float):
+        if scale == 1.0:
+            return img
+        return cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def _scale_matrix(scale: float) -> np.ndarray:
+        return np.diag([scale, scale, 1.0])
+
+    @classmethod
+    def _compute_features(
+        cls,
+        gray,
+        full_shape: Tuple[int, int],
+        scale: float = 1.0,
+        max_features: Optional[int] = None,
+    ) -> TemplateFeatures:
+        orb = cv2.ORB_create(max_features or cls.MAX_FEATURES)
+        keypoints, descriptors = orb.detectAndCompute(gray, None)
+
+        if descriptors is None:
+            descriptors = np.zeros((0, 32), dtype=np.uint8)
+
+        return TemplateFeatures(
+            points=cv2.KeyPoint_convert(keypoints).reshape(-1, 2).astype(np.float32),
+            descriptors=descriptors,
+            shape=tuple(full_shape),
+            scale=scale,
+        )
+
+    @classmethod
+    def _load_features(cls, cache_key: str) -> Optional[TemplateFeatures]:
+        npz_path = cls.cache_dir / f"{cache_key}.npz"
+        if not npz_path.exists():
+            return None
+
+        try:
+            with np.load(npz_path) as data:
+                return TemplateFeatures(
+                    points=data["points"],
+                    descriptors=data["descriptors"],
+                    shape=tuple(int(v) for v in data["shape"]),
+                    scale=float(data["scale"]),
+                )
+        except Exception as e:
+            print(f"[WARNING] 템플릿 특징점 캐시 읽기 실패: {e}")
+            return None
+
+    @classmethod
+    def _save_features(cls, cache_key: str, path_key: str, features: TemplateFeatures):
+        try:
+            cls.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # 같은 템플릿 경로의 이전 버전 캐시 삭제 (템플릿 변경 시 무효화)
+            content_prefix = cache_key.rsplit("_", 2)[0]
+            for old_file in cls.cache_dir.glob(f"{path_key}_*.npz"):
+                if not old_file.stem.startswith(content_prefix):
+                    old_file.unlink(missing_ok=True)
+
+            # 여러 프로세스가 동시에 쓰더라도 깨진 파일이 남지 않도록 교체 방식으로 저장
+            tmp_path = cls.cache_dir / f"{cache_key}.{os.getpid()}.tmp.npz"
+            np.savez(
+                tmp_path,
+                points=features.points,
+                descriptors=features.descriptors,
+                shape=np.array(features.shape),
+                scale=np.array(features.scale),
+            )
+            os.replace(tmp_path, cls.cache_dir / f"{cache_key}.npz")
+        except Exception as e:
+            print(f"[WARNING] 템플릿 특징점 캐시 저장 실패: {e}")
+
+    @classmethod
+    def _get_template_gray(cls, template_path, max_side: int):
+        # ECC 보정용 템플릿 축소본 (메모리에만 보관)
+        key = f"{cls.template_hash(template_path)}_{max_side}"
+        gray = cls._gray_cache.get(key)
+        if gray is None:
+            template_img = ImageLoader.load_image(template_path)
+            if template_img is None:
+                return None
+            gray = cls._to_gray(template_img)
+            gray = cls._resize(gray, cls._get_scale(gray, max_side))
+            cls._gray_cache[key] = gray
+        return gray
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._feature_cache.clear()
+            cls._hash_cache.clear()
+            cls._gray_cache.clear()
+
+    @staticmethod
+    def align(
+        target_img,
+        template_path: Union[str, Path],
+        pyramid: bool = False,
+        refine: bool = True,
+        warp: bool = True,
+        fast_check: bool = False,
+        max_features: Optional[int] = None,
+        good_match_percent: Optional[float] = None,
+        matcher: Optional[str] = None,
+        matches: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> AlignResult:
+        """
+        pyramid : 축소본에서 호모그래피를 추정하고 원본 해상도로 환산
+        refine : 피라미드 추정 오차가 클 때만 ECC로 보정
+        warp : False면 행렬만 구하고 전체 페이지 변환은 생략 (warp_roi 사용)
+        fast_check : 이미 맞춰진 스캔이면 ORB 정합 없이 이동 행렬만 반환
+        max_features / good_match_percent / matcher : 서식별 정렬 설정 (None이면 기본값)
+        matches : 이미 구한 매칭 (대상 좌표(원본 해상도), 템플릿 특징점 인덱스)
+                  - 서식 분류 결과를 재사용하여 ORB 검출/매칭 생략
+        """
+        start = time.perf_counter()
+        result = AlignResult(image=target_img)
+
+        try:
+            max_side = ImageAligner.PYRAMID_MAX_SIDE if pyramid else 0
+            template = ImageAligner.get_template_features(
+                template_path, max_side, max_features
+            )
+            if template is None:
+                return result
+
+            target_gray = ImageAligner._to_gray(target_img)
+
+            prealigned = None
+            if fast_check and matches is None:
+                prealigned = ImageAligner._check_prealigned(
+                    target_gray, template_path, template.shape
+                )
+
+            if prealigned is not None:
+                h, result.residual = prealigned
+                result.inlier_ratio = 1.0
+                result.method = "fast"
+            else:
+                h = ImageAligner._align_features(
+                    target_gray,
+                    template,
+                    template_path,
+                    max_side,
+                    refine,
+                    result,
+                    matches=matches,
+                    max_features=max_features,
+                    good_match_percent=good_match_percent,
+                    matcher=matcher,
+                )
+                if h is None:
+                    return result
+
+            height, width = template.shape
+            if warp:
+                is_identity = np.allclose(h, np.eye(3))
+                if is_identity and target_img.shape[:2] == (height, width):
+                    result.image = target_img
+                else:
+                    result.image = cv2.warpPerspective(target_img, h, (width, height))
+            result.matrix = h
+            result.template_shape = template.shape
+            return result
+
+        except Exception as e:
+            print(f"[ERROR] 이미지 정렬 중 오류: {e}")
+            return result
+
+        finally:
+            result.elapsed = time.perf_counter() - start
+
+    @staticmethod
+    def _align_features(
+        target_gray,
+        template: TemplateFeatures,
+        template_path,
+        max_side: int,
+        refine: bool,
+        result: AlignResult,
+        matches: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        **match_settings,
+    ) -> Optional[np.ndarray]:
+        target_scale = ImageAligner._get_scale(target_gray, max_side)
+
+        if matches is not None:
+            # 주어진 매칭 사용 (대상 좌표는 원본 해상도 -> 축소 좌표)
+            target_points, template_idx = matches
+            estimated = ImageAligner._homography_from_points(
+                np.float32(target_points) * target_scale,
+                template.points[np.asarray(template_idx, dtype=int)],
+            )
+        else:
+            # 대상 이미지의 특징점만 새로 검출
+            small_gray = ImageAligner._resize(target_gray, target_scale)
+            estimated = ImageAligner._estimate_homography(
+                small_gray, template, **match_settings
+            )
+        if estimated is None:
+            return None
+
+        h_small, mask, points1, points2 = estimated
+
+        # 축소 좌표계 행렬 -> 원본 좌표계 행렬
+        h = (
+            np.linalg.inv(ImageAligner._scale_matrix(template.scale))
+            @ h_small
+            @ ImageAligner._scale_matrix(target_scale)
+        )
+
+        inliers = mask.ravel().astype(bool)
+        projected = cv2.perspectiveTransform(
+            points1[inliers].reshape(-1, 1, 2), h_small
+        )
+        errors = np.linalg.norm(projected.reshape(-1, 2) - points2[inliers], axis=1)
+
+        result.inlier_ratio = float(inliers.mean())
+        result.residual = float(errors.mean() / template.scale) if len(errors) else 0.0
+        result.method = "pyramid" if max_side else "orb"
+
+        if max_side and refine and result.residual > ImageAligner.REFINE_RESIDUAL_PX:
+            refined = ImageAligner._refine_ecc(
+                target_gray, template_path, template.shape, h
+            )
+            if refined is not None:
+                h = refined
+                result.method = "pyramid+ecc"
+
+        return h
+
+    @staticmethod
+    def _check_prealigned(target_gray, template_path, template_shape):
+        """
+        축소본 위상 상관(phase correlation)으로 이동량만 확인한다.
+        페이지 전체와 4분할 영역의 이동량이 허용 오차 안에서 일치하면
+        (회전/기울어짐 없음) 반환값 : (이동 행렬, 잔차 px), 아니면 None
+        """
+        template_h, template_w = template_shape
+        target_h, target_w = target_gray.shape[:2]
+
+        # 해상도가 달라도 종횡비가 같으면 배율만 보정
+        page_scale = template_w / target_w
+        if abs(target_h * page_scale - template_h) > template_h * 0.01:
+            return None
+
+        template_small = ImageAligner._get_template_gray(
+            template_path, ImageAligner.FAST_CHECK_MAX_SIDE
+        )
+        if template_small is None:
+            return None
+
+        small_h, small_w = template_small.shape[:2]
+        target_small = cv2.resize(
+            target_gray, (small_w, small_h), interpolation=cv2.INTER_AREA
+        )
+
+        template_f = np.float32(template_small)
+        target_f = np.float32(target_small)
+        (dx, dy), response = cv2.phaseCorrelate(template_f, target_f)
+        if response < ImageAligner.FAST_CHECK_MIN_RESPONSE:
+            return None
+
+        # 4분할 영역별 이동량: 회전/원근 왜곡이 있으면 영역마다 달라진다
+        half_h, half_w = small_h // 2, small_w // 2
+        deviations = []
+        for y0 in (0, half_h):
+            for x0 in (0, half_w):
+                (qx, qy), q_response = cv2.phaseCorrelate(
+                    template_f[y0 : y0 + half_h, x0 : x0 + half_w],
+                    target_f[y0 : y0 + half_h, x0 : x0 + half_w],
+                )
+                if q_response >= ImageAligner.FAST_CHECK_MIN_RESPONSE:
+                    deviations.append(np.hypot(qx - dx, qy - dy))
+
+        if len(deviations) < 2:
+            return None
+
+        # 축소 좌표 -> 템플릿 원본 좌표
+        to_full = template_w / small_w
+        residual = float(max(deviations) * to_full)
+        if residual > ImageAligner.FAST_CHECK_TOLERANCE_PX:
+            return None
+
+        shift_x, shift_y = dx * to_full, dy * to_full
+        if np.hypot(shift_x, shift_y) < 0.5:
+            shift_x = shift_y = 0.0
+
+        h = np.array(
+            [
+                [page_scale, 0.0, -shift_x],
+                [0.0, page_scale, -shift_y],
+                [0.0, 0.0, 1.0],
+            ]
+        )
+        return h, residual
+
+    @staticmethod
+    def warp_roi(target_img, matrix, x, y, w, h, margin: Optional[int] = None):
+        """
+        템플릿 좌표계의 ROI(x, y, w, h)만 변환하여 잘라낸다.
+        전체 페이지를 변환한 뒤 자른 것과 같은 결과를 ROI 크기의 버퍼로 얻는다.
+        """
+        if margin is None:
+            margin = ImageAligner.ROI_WARP_MARGIN
+
+        # 출력 버퍼 원점을 ROI 좌상단(여백 포함)으로 옮기는 이동 행렬
+        shift = np.array(
+            [[1.0, 0.0, margin - x], [0.0, 1.0, margin - y], [0.0, 0.0, 1.0]]
+        )
+        warped = cv2.warpPerspective(
+            target_img, shift @ matrix, (w + margin * 2, h + margin * 2)
+        )
+        return warped[margin : margin + h, margin : margin + w]
+
+    @staticmethod
+    def match_features(
+        descriptors,
+        template: TemplateFeatures,
+        good_match_percent: Optional[float] = None,
+        matcher: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        대상 기술자를 템플릿 기술자와 매칭한다.
+        반환값 : (대상 인덱스, 템플릿 인덱스) 배열 - 거리가 가까운 순
+        """
+        if good_match_percent is None:
+            good_match_percent = ImageAligner.GOOD_MATCH_PERCENT
+        matcher = matcher or ImageAligner.DEFAULT_MATCHER
+
+        if matcher == ImageAligner.MATCHER_BF:
+            # 기존 방식: 교차 검증 매칭 중 거리순 상위 N%
+            matches = template.matcher.match(descriptors)
+            pairs = np.array(
+                [(m.queryIdx, m.trainIdx, m.distance) for m in matches]
+            ).reshape(-1, 3)
+            pairs = pairs[np.argsort(pairs[:, 2], kind="stable")]
+            pairs = pairs[: int(len(pairs) * good_match_percent)]
+            return pairs[:, 0].astype(int), pairs[:, 1].astype(int)
+
+        empty = np.zeros(0, dtype=int)
+        if len(template.descriptors) < 2:
+            return empty, empty
+
+        # 가장 가까운 두 후보의 (인덱스, 거리): (N, 2) 배열
+        if matcher == ImageAligner.MATCHER_FLANN:
+            train_idx, distances = ImageAligner._get_flann_index(template).knnSearch(
+                descriptors, 2, params={}
+            )
+        else:
+            distances, train_idx = cv2.batchDistance(
+                descriptors,
+                template.descriptors,
+                cv2.CV_32S,
+                normType=cv2.NORM_HAMMING,
+                K=2,
+            )
+
+        # 비율 검사: 1순위가 2순위보다 확실히 가까운 매칭만 사용
+        valid = (train_idx >= 0).all(axis=1) & (
+            distances[:, 0] < distances[:, 1] * ImageAligner.RATIO_TEST
+        )
+        query_idx = np.flatnonzero(valid)
+        query_idx = query_idx[np.argsort(distances[query_idx, 0], kind="stable")]
+
+        # 대상 특징점 수 대비 상위 N%까지만 사용
+        limit = max(4, int(len(descriptors) * good_match_percent))
+        query_idx = query_idx[:limit]
+        return query_idx, train_idx[query_idx, 0].astype(int)
+
+    @staticmethod
+    def _get_flann_index(template: TemplateFeatures):
+        # 템플릿 기술자로 LSH 색인을 한 번만 만들고 재사용
+        with ImageAligner._cache_lock:
+            if template.flann_index is None:
+                template.flann_index = cv2.flann_Index(
+                    template.descriptors, ImageAligner.FLANN_LSH_PARAMS
+                )
+            return template.flann_index
+
+    @staticmethod
+    def _estimate_homography(
+        target_gray,
+        template: TemplateFeatures,
+        max_features: Optional[int] = None,
+        good_match_percent: Optional[float] = None,
+        matcher: Optional[str] = None,
+    ):
+        """반환값 : (호모그래피, 인라이어 마스크, 대상 좌표, 템플릿 좌표) 또는 None"""
+        orb = cv2.ORB_create(max_features or ImageAligner.MAX_FEATURES)
+        keypoints, descriptors = orb.detectAndCompute(target_gray, None)
+
+        if descriptors is None or len(template.descriptors) == 0:
+            print("[WARNING] 특징점이 부족하여 정렬을 수행할 수 없습니다.")
+            return None
+
+        query_idx, train_idx = ImageAligner.match_features(
+            descriptors, template, good_match_percent, matcher
+        )
+
+        target_points = cv2.KeyPoint_convert(keypoints).reshape(-1, 2)
+        return ImageAligner._homography_from_points(
+            target_points[query_idx].astype(np.float32), template.points[train_idx]
+        )
+
+    @staticmethod
+    def _homography_from_points(points1, points2):
+        """대응점(대상 -> 템플릿)으로 RANSAC 호모그래피 추정 (_estimate_homography 반환값)"""
+        if len(points1) < 4:
+            print("[WARNING] 특징점이 부족하여 정렬을 수행할 수 없습니다.")
+            return None
+
+        h, mask = cv2.findHomography(points1, points2, cv2.RANSAC)
+
+        if h is None:
+            print("[WARNING] 정렬 실패: 호모그래피 행렬을 찾을 수 없음")
+            return None
+
+        return h, mask, points1, points2
+
+    @staticmethod
+    def _refine_ecc(target_gray, template_path, template_shape, h_full):
+        """피라미드 추정 행렬을 초기값으로 ECC 보정 (실패 시 None)"""
+        template_gray = ImageAligner._get_template_gray(
+            template_path, ImageAligner.REFINE_MAX_SIDE
+        )
+        if template_gray is None:
+            return None
+
+        template_scale = template_gray.shape[0] / template_shape[0]
+        target_scale = ImageAligner._get_scale(
+            target_gray, ImageAligner.REFINE_MAX_SIDE
+        )
+        target_small = ImageAligner._resize(target_gray, target_scale)
+
+        s_tpl = ImageAligner._scale_matrix(template_scale)
+        s_tgt = ImageAligner._scale_matrix(target_scale)
+        h_mid = s_tpl @ h_full @ np.linalg.inv(s_tgt)
+
+        # ECC의 warp 행렬은 템플릿 -> 대상 방향
+        warp = np.linalg.inv(h_mid).astype(np.float32)
+        criteria = (
+            cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT,
+            ImageAligner.REFINE_ITERATIONS,
+            1e-4,
+        )
+
+        try:
+            _, warp = cv2.findTransformECC(
+                template_gray,
+                target_small,
+                warp,
+                cv2.MOTION_HOMOGRAPHY,
+                criteria,
+                None,
+                5,
+            )
+        except cv2.error as e:
+            print(f"[WARNING] ECC 보정 실패: {e}")
+            return None
+
+        h_mid = np.linalg.inv(warp.astype(np.float64))
+        return np.linalg.inv(s_tpl) @ h_mid @ s_tgt
+
     @staticmethod
     def align_images(target_img, template_img):
         """
@@ -17,8 +634,8 @@ class ImageAligner:
 
         try:
             # 1. 흑백 변환
-            target_gray = cv2.cvtColor(target_img, cv2.COLOR_BGR2GRAY)
-            template_gray = cv2.cvtColor(template_img, cv2.COLOR_BGR2GRAY)
+            target_gray = ImageAligner._to_gray(target_img)
+            template_gray = ImageAligner._to_gray(template_img)
 
             # 2. 특징점 감지기(ORB) 생성
             orb = cv2.ORB_create(ImageAligner.MAX_FEATURES)
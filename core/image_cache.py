@@ -0,0 +1,255 @@
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from core.image_loader import ImageLoader
+from core.image_aligner import ImageAligner
+
+
+class ImageCache:
+    """
+    디코딩한 이미지, 정렬한 이미지, 호모그래피를 프로세스 전체에서 공유하는 LRU 캐시
+    (검증 화면/서식 편집기/배치가 같은 스캔을 반복해서 읽고 정렬하지 않도록)
+    키 : (종류, 파일 경로, 수정 시각, 파일 크기, 페이지, 템플릿 해시, 정렬 설정)
+    """
+
+    _instance = None
+
+    MAX_BYTES = 512 * 1024 * 1024  # 캐시 전체 용량 (초과 시 오래된 항목부터 제거)
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ImageCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, "_initialized", False):
+            return
+
+        self.max_bytes = self.MAX_BYTES
+        self._entries: "OrderedDict[tuple, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._initialized = True
+
+    @staticmethod
+    def file_key(file_path: Union[str, Path], page: int = 0) -> Optional[tuple]:
+        # 파일이 바뀌면(수정 시각/크기) 다른 키가 되어 이전 항목은 자연히 밀려난다
+        try:
+            path_obj = Path(file_path).resolve()
+            stat = path_obj.stat()
+        except OSError:
+            return None
+        return (str(path_obj), stat.st_mtime_ns, stat.st_size, page)
+
+    @staticmethod
+    def file_stamp(file_path: Union[str, Path]) -> str:
+        # 결과(엑셀)에 함께 기록하는 원본 파일 식별값 : "수정 시각:크기"
+        file_key = ImageCache.file_key(file_path)
+        return f"{file_key[1]}:{file_key[2]}" if file_key else ""
+
+    @staticmethod
+    def encode_matrix(
+        matrix: np.ndarray,
+        template_shape: Tuple[int, int],
+        template_path: Union[str, Path],
+    ) -> str:
+        # 결과의 숨김 컬럼에 기록할 문자열 (템플릿이 바뀌면 쓰지 않도록 해시 포함)
+        return json.dumps(
+            {
+                "matrix": np.asarray(matrix, dtype=float).ravel().tolist(),
+                "shape": [int(v) for v in template_shape],
+                "template": ImageAligner.template_hash(template_path),
+            }
+        )
+
+    @staticmethod
+    def template_key(
+        template_path: Union[str, Path], settings: Optional[Dict] = None
+    ) -> tuple:
+        settings_key = tuple(sorted((settings or {}).items()))
+        return (ImageAligner.template_hash(template_path), settings_key)
+
+    @staticmethod
+    def _nbytes(value) -> int:
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, tuple):
+            return sum(ImageCache._nbytes(v) for v in value)
+        return 0
+
+    @staticmethod
+    def _freeze(value):
+        # 공유되는 배열이 호출하는 쪽에서 수정되지 않도록 읽기 전용으로
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+        elif isinstance(value, tuple):
+            for v in value:
+                ImageCache._freeze(v)
+        return value
+
+    def get(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, value) -> None:
+        size = self._nbytes(value)
+        if size > self.max_bytes:
+            return
+
+        self._freeze(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            while self._entries and self._bytes + size > self.max_bytes:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def load_image(
+        self, file_path: Union[str, Path], page: int = 0
+    ) -> Optional[np.ndarray]:
+        file_key = self.file_key(file_path, page)
+        if file_key is None:
+            return ImageLoader.load_image(file_path, page=page)
+
+        key = ("decoded",) + file_key
+        img = self.get(key)
+        if img is None:
+            img = ImageLoader.load_image(file_path, page=page)
+            if img is not None:
+                self.put(key, img)
+        return img
+
+    def put_matrix(
+        self,
+        file_path: Union[str, Path],
+        template_path: Union[str, Path],
+        settings: Optional[Dict],
+        matrix: np.ndarray,
+        template_shape: Tuple[int, int],
+        page: int = 0,
+    ) -> None:
+        # 배치에서 구한 행렬 기록 (원본 해상도 기준 행렬만)
+        file_key = self.file_key(file_path, page)
+        if file_key is None or matrix is None:
+            return
+        key = ("matrix",) + file_key + self.template_key(template_path, settings)
+        self.put(key, (matrix, np.array(template_shape)))
+
+    def restore_matrix(
+        self,
+        text: str,
+        stamp: str,
+        file_path: Union[str, Path],
+        template_path: Union[str, Path],
+        settings: Optional[Dict] = None,
+        page: int = 0,
+    ) -> bool:
+        """
+        결과에 기록된 행렬(encode_matrix)을 캐시에 등록한다.
+        파일이나 템플릿이 바뀌었거나 값이 없으면 False (load_aligned가 다시 정렬)
+        """
+        if not text or not stamp or stamp != self.file_stamp(file_path):
+            return False
+
+        try:
+            data = json.loads(text)
+            if data["template"] != ImageAligner.template_hash(template_path):
+                return False
+            matrix = np.array(data["matrix"], dtype=float).reshape(3, 3)
+            template_shape = tuple(int(v) for v in data["shape"])
+        except (ValueError, KeyError, TypeError, OSError):
+            return False
+
+        self.put_matrix(
+            file_path, template_path, settings, matrix, template_shape, page
+        )
+        return True
+
+    def load_aligned(
+        self,
+        file_path: Union[str, Path],
+        template_path: Union[str, Path],
+        settings: Optional[Dict] = None,
+        page: int = 0,
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        템플릿에 맞춰 정렬한 이미지와 행렬 (정렬 실패 시 원본 이미지와 None)
+        이미 구한 행렬이 있으면 ORB 정합 없이 변환만 수행
+        """
+        settings = settings or {}
+        file_key = self.file_key(file_path, page)
+        if file_key is None:
+            return None, None
+
+        template_key = self.template_key(template_path, settings)
+        aligned_key = ("aligned",) + file_key + template_key
+        cached = self.get(aligned_key)
+        if cached is not None:
+            image, matrix = cached
+            return image, (matrix if matrix.size else None)
+
+        img = self.load_image(file_path, page)
+        if img is None:
+            return None, None
+
+        stored = self.get(("matrix",) + file_key + template_key)
+        if stored is not None:
+            matrix, template_shape = stored
+            height, width = (int(v) for v in template_shape)
+            image = cv2.warpPerspective(img, matrix, (width, height))
+        else:
+            result = ImageAligner.align(img, template_path, **settings)
+            image, matrix = result.image, result.matrix
+            if matrix is not None:
+                self.put_matrix(
+                    file_path,
+                    template_path,
+                    settings,
+                    matrix,
+                    result.template_shape,
+                    page,
+                )
+
+        # 정렬 실패도 기록해 두어 같은 파일을 다시 정합하지 않음
+        self.put(aligned_key, (image, matrix if matrix is not None else np.empty(0)))
+        return image, matrix
@@ -1,13 +1,25 @@
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
 import cv2
 import numpy as np
 import fitz
+from PIL import Image
 
 
 class ImageLoader:
+    PDF_DPI = 300  # OCR용 변환 해상도
+    PDF_ALIGN_DPI = 100  # 정렬용 저해상도 변환 (ROI는 PDF_DPI로 따로 변환)
+    PDF_TEXT_MIN_CHARS = 20  # 텍스트 레이어로 인정할 최소 글자 수
+    TIFF_EXTS = (".tif", ".tiff")
+
     @staticmethod
-    def load_image(file_path: Union[str, Path]) -> Optional[np.ndarray]:
+    def load_image(
+        file_path: Union[str, Path],
+        pdf_dpi: Optional[int] = None,
+        page: int = 0,
+        grayscale: bool = False,
+    ) -> Optional[np.ndarray]:
+        """grayscale=True면 BGR 대신 1채널(흑백)로 디코딩"""
         path_obj = Path(file_path)
 
         if not path_obj.exists():
@@ -18,11 +30,14 @@ class ImageLoader:
         ext = path_obj.suffix.lower()
 
         try:
-            if ext == ".pdf":
-                img = ImageLoader._pdf_to_image(path_obj)
+            if ext == ".pdf" or ext in ImageLoader.TIFF_EXTS:
+                img, _ = ImageLoader.load_page(
+                    path_obj, page, pdf_dpi, grayscale=grayscale
+                )
             else:
                 img_array = np.fromfile(str(path_obj), np.uint8)
-                img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+                flags = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+                img = cv2.imdecode(img_array, flags)
 
             return img
 
@@ -31,27 +46,176 @@ class ImageLoader:
             return None
 
     @staticmethod
-    def _pdf_to_image(pdf_path: Path) -> Optional[np.ndarray]:
+    def count_pages(file_path: Union[str, Path]) -> int:
+        # 페이지를 디코딩하지 않고 수만 확인 (단일 이미지는 1)
+        ext = Path(file_path).suffix.lower()
+        try:
+            if ext == ".pdf":
+                with fitz.open(file_path) as doc:
+                    return len(doc)
+            if ext in ImageLoader.TIFF_EXTS:
+                with Image.open(file_path) as tiff:
+                    return getattr(tiff, "n_frames", 1)
+        except Exception as e:
+            print(f"페이지 수 확인 오류: {e}")
+        return 1
+
+    @staticmethod
+    def load_page(
+        file_path: Union[str, Path],
+        page: int,
+        pdf_dpi: Optional[int] = None,
+        pdf_text: bool = False,
+        grayscale: bool = False,
+    ) -> Tuple[Optional[np.ndarray], Optional[List[Tuple]]]:
+        """페이지 하나만 읽는다. 반환값 : (이미지, PDF 단어) - iter_pages 참고"""
+        pages = ImageLoader.iter_pages(
+            file_path, pdf_dpi, pdf_text, grayscale=grayscale, start=page
+        )
+        try:
+            _, img, words = next(pages, (page, None, None))
+            return img, words
+        finally:
+            pages.close()
+
+    @staticmethod
+    def iter_pages(
+        file_path: Union[str, Path],
+        pdf_dpi: Optional[int] = None,
+        pdf_text: bool = False,
+        grayscale: bool = False,
+        start: int = 0,
+    ) -> Iterator[Tuple[int, Optional[np.ndarray], Optional[List[Tuple]]]]:
+        """
+        여러 페이지 PDF/TIFF를 한 페이지씩 디코딩하여 돌려준다 (메모리에는 한 페이지만).
+        반환값 : (페이지 번호(0부터), BGR 이미지, PDF 단어)
+                 pdf_text=True이고 텍스트 레이어가 있으면 이미지 대신 단어 목록
+        """
+        path_obj = Path(file_path)
+        ext = path_obj.suffix.lower()
+
+        if ext == ".pdf":
+            with fitz.open(path_obj) as doc:
+                for page_no in range(start, len(doc)):
+                    page = doc.load_page(page_no)
+                    words = ImageLoader._get_page_words(page) if pdf_text else None
+                    if words is not None:
+                        yield page_no, None, words
+                        continue
+
+                    try:
+                        pix = page.get_pixmap(
+                            dpi=pdf_dpi or ImageLoader.PDF_DPI,
+                            colorspace=fitz.csGRAY if grayscale else fitz.csRGB,
+                        )
+                        yield page_no, ImageLoader._pixmap_to_array(pix), None
+                    except Exception as e:
+                        print(f"PDF 변환 오류: {e}")
+                        yield page_no, None, None
+
+        elif ext in ImageLoader.TIFF_EXTS:
+            with Image.open(path_obj) as tiff:
+                for page_no in range(start, getattr(tiff, "n_frames", 1)):
+                    try:
+                        tiff.seek(page_no)
+                        if grayscale:
+                            yield page_no, np.array(tiff.convert("L")), None
+                        else:
+                            rgb = np.asarray(tiff.convert("RGB"))
+                            yield page_no, cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR), None
+                    except Exception as e:
+                        print(f"TIFF 변환 오류: {e}")
+                        yield page_no, None, None
+
+        elif start == 0:
+            yield 0, ImageLoader.load_image(path_obj, grayscale=grayscale), None
+
+    @staticmethod
+    def render_pdf_clips(
+        pdf_path: Union[str, Path],
+        clips: Sequence[Tuple[float, float, float, float]],
+        dpi: int = PDF_DPI,
+        relative: bool = False,
+        page_no: int = 0,
+        grayscale: bool = False,
+    ) -> List[Tuple[Optional[np.ndarray], Tuple[int, int]]]:
+        """
+        페이지의 일부 영역만 변환한다.
+        clips : [(x0, y0, x1, y1), ...] PDF 좌표(pt), relative=True면 페이지 대비 비율
+        반환값 : [(BGR 또는 흑백 이미지, (x, y)), ...] - (x, y)는 dpi 기준 페이지 내 좌상단 픽셀
+                 (페이지 밖 영역은 이미지가 None)
+        """
         doc = fitz.open(pdf_path)
 
         try:
-            if len(doc) > 0:
-                page = doc.load_page(0)
-                pix = page.get_pixmap(dpi=300)  # 고화질 변환
+            page = doc.load_page(page_no)
+            page_rect = page.rect
 
-                # PyMuPDF 이미지를 OpenCV 포맷으로 변환
-                img_data = np.frombuffer(pix.samples, dtype=np.uint8)
+            images = []
+            for x0, y0, x1, y1 in clips:
+                if relative:
+                    x0, x1 = x0 * page_rect.width, x1 * page_rect.width
+                    y0, y1 = y0 * page_rect.height, y1 * page_rect.height
 
-                # RGB to BGR (OpenCV는 BGR 사용)
-                if pix.n >= 3:
-                    img_data = img_data.reshape(pix.h, pix.w, pix.n)
-                    img_cv = cv2.cvtColor(img_data, cv2.COLOR_RGB2BGR)
-                else:
-                    img_data = img_data.reshape(pix.h, pix.w)
-                    img_cv = cv2.cvtColor(img_data, cv2.COLOR_GRAY2BGR)
+                clip = fitz.Rect(x0, y0, x1, y1) & page_rect
+                if clip.is_empty:
+                    images.append((None, (0, 0)))
+                    continue
 
-                return img_cv
+                pix = page.get_pixmap(
+                    dpi=dpi,
+                    clip=clip,
+                    colorspace=fitz.csGRAY if grayscale else fitz.csRGB,
+                )
+                images.append((ImageLoader._pixmap_to_array(pix), (pix.x, pix.y)))
+            return images
 
+        finally:
+            doc.close()
+
+    @staticmethod
+    def _get_page_words(page) -> Optional[List[Tuple]]:
+        """
+        텍스트 레이어의 단어 목록 (쓸 만한 텍스트가 없으면 None)
+        반환값 : [(x0, y0, x1, y1, word), ...] 페이지 대비 비율 좌표, 읽기 순서
+        """
+        try:
+            words = page.get_text("words")
         except Exception as e:
-            print(f"PDF 변환 오류: {e}")
+            print(f"PDF 텍스트 추출 오류: {e}")
+            return None
+
+        # 스캔본(텍스트 없음)이나 글꼴 정보가 깨진 텍스트는 사용하지 않음
+        text = "".join(w[4] for w in words)
+        if len(text) < ImageLoader.PDF_TEXT_MIN_CHARS:
+            return None
+        if text.count("\ufffd") > len(text) * 0.1:
             return None
+
+        page_w, page_h = page.rect.width, page.rect.height
+        return [
+            (x0 / page_w, y0 / page_h, x1 / page_w, y1 / page_h, word)
+            for x0, y0, x1, y1, word, *_ in words
+        ]
+
+    @staticmethod
+    def words_in_rect(words: List[Tuple], x: float, y: float, w: float, h: float):
+        # 단어 중심이 영역(비율 좌표) 안에 있는 단어만 읽기 순서대로 연결
+        picked = [
+            word
+            for x0, y0, x1, y1, word in words
+            if x <= (x0 + x1) / 2 <= x + w and y <= (y0 + y1) / 2 <= y + h
+        ]
+        return " ".join(picked)
+
+    @staticmethod
+    def _pixmap_to_array(pix) -> np.ndarray:
+        # PyMuPDF 이미지를 OpenCV 포맷으로 변환 (흑백 pixmap은 1채널 그대로)
+        img_data = np.frombuffer(pix.samples, dtype=np.uint8)
+
+        # RGB to BGR (OpenCV는 BGR 사용)
+        if pix.n >= 3:
+            img_data = img_data.reshape(pix.h, pix.w, pix.n)
+            return cv2.cvtColor(img_data, cv2.COLOR_RGB2BGR)
+
+        return img_data.reshape(pix.h, pix.w).copy()
@@ -0,0 +1,65 @@
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 키워드 자동자 : 문자열을 한 번만 훑어 등록된 모든 키워드를 찾는다.
+    (서식 수 x 키워드 수 x 파일 수 만큼 `k in filename`을 반복하지 않도록)
+
+    keywords : [(키워드, 값), ...] - 등록 순서가 우선순위 (앞일수록 높음)
+    여러 키워드가 맞으면 가장 긴 키워드, 길이가 같으면 우선순위가 높은 값을 고른다.
+    빈 키워드는 무시한다.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, Any]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 노드에서 끝나는 키워드 : [(키워드 길이, 우선순위, 키워드, 값), ...]
+        self._output: List[List[Tuple[int, int, str, Any]]] = [[]]
+
+        for priority, (keyword, value) in enumerate(keywords):
+            if keyword:
+                self._add(keyword, (len(keyword), priority, keyword, value))
+        self._build()
+
+    def _add(self, keyword: str, entry: Tuple[int, int, str, Any]):
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+        self._output[node].append(entry)
+
+    def _build(self):
+        # BFS로 실패 링크 연결, 실패 노드의 출력도 합쳐 둔다
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def best_match(self, text: str) -> Optional[Any]:
+        best = None
+        node = 0
+        for ch in text:
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+
+            for entry in self._output[node]:
+                # 긴 키워드 우선, 같은 길이면 우선순위(등록 순서)가 앞선 값
+                if best is None or (entry[0], -entry[1]) > (best[0], -best[1]):
+                    best = entry
+        return best[3] if best else None
@@ -0,0 +1,168 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class OCRCropCache:
+    """
+    전처리한 ROI 이미지 -> 인식 결과 (텍스트, 신뢰도) 캐시 (같은 crop은 한 번만 인식)
+    인쇄된 문구/고정 체크박스 라벨/빈 칸처럼 문서마다 같은 영역을 다시 인식하지 않도록.
+
+    키 : 전처리 결과(이진 이미지)의 해시 + 크기 + Tesseract 설정 + 백엔드 이름
+    1단계 : 메모리 LRU (항목 수 제한)
+    2단계 : SQLite 파일 (선택, 프로세스 간/실행 간 공유)
+    """
+
+    MAX_ENTRIES = 20000  # 메모리 항목 수 (초과 시 오래된 항목부터 제거)
+    COST_WEIGHT = 0.2  # crop당 인식 시간 이동 평균의 가중치
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.disk_path: Optional[Path] = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0  # 캐시 적중으로 생략한 인식 시간 (추정)
+        self._crop_cost = 0.0  # crop 하나의 평균 인식 시간(초)
+
+    @staticmethod
+    def make_key(crop: np.ndarray, config, backend_name: str) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(crop).data)
+        digest.update(f"{crop.shape}|{crop.dtype}|{config!r}|{backend_name}".encode())
+        return digest.hexdigest()
+
+    def open_disk(self, db_path: Union[str, Path, None]) -> None:
+        # 같은 경로면 그대로, None이면 디스크 단계 사용 안 함
+        path = Path(db_path) if db_path else None
+        if path == self.disk_path:
+            return
+
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self.disk_path = path
+            if path is None:
+                return
+
+            try:
+                # 여러 스레드(UI/배치)에서 사용하므로 잠금으로 직렬화
+                conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS crop_results (key TEXT PRIMARY KEY,"
+                    " text TEXT NOT NULL, confidence REAL NOT NULL)"
+                )
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                print(f"[WARNING] OCR 캐시 파일을 열 수 없습니다: {e}")
+                self.disk_path = None
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Tuple[str, float]]:
+        found: Dict[str, Tuple[str, float]] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                value = self._entries.get(key)
+                if value is None:
+                    missing.append(key)
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = value
+
+            if missing and self._conn is not None:
+                for key, text, confidence in self._disk_lookup(missing):
+                    found[key] = (text, confidence)
+                    self._remember(key, found[key])
+                    self.disk_hits += 1
+
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+            self.saved_seconds += hits * self._crop_cost
+        return found
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        return self.get_many([key]).get(key)
+
+    def put_many(
+        self, items: Sequence[Tuple[str, Tuple[str, float]]], seconds: float
+    ) -> None:
+        """items : [(키, (텍스트, 신뢰도)), ...], seconds : 이 crop들을 인식하는 데 걸린 시간"""
+        if not items:
+            return
+
+        with self._lock:
+            cost = seconds / len(items)
+            if self._crop_cost:
+                cost = self._crop_cost + self.COST_WEIGHT * (cost - self._crop_cost)
+            self._crop_cost = cost
+
+            for key, value in items:
+                self._remember(key, tuple(value))
+
+            if self._conn is not None:
+                try:
+                    with self._conn:
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO crop_results VALUES (?, ?, ?)",
+                            [(key, value[0], value[1]) for key, value in items],
+                        )
+                except sqlite3.Error as e:
+                    print(f"[WARNING] OCR 캐시 기록 실패: {e}")
+
+    def put(self, key: str, value: Tuple[str, float], seconds: float) -> None:
+        self.put_many([(key, value)], seconds)
+
+    def _disk_lookup(self, keys: List[str]) -> List[Tuple[str, str, float]]:
+        rows = []
+        try:
+            # sqlite 변수 개수 제한을 넘지 않도록 나누어 조회
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                rows += self._conn.execute(
+                    "SELECT key, text, confidence FROM crop_results"
+                    f" WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"[WARNING] OCR 캐시 조회 실패: {e}")
+        return rows
+
+    def _remember(self, key: str, value: Tuple[str, float]) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_seconds": self.saved_seconds,
+            }
@@ -1,12 +1,227 @@
 import sys
+import bisect
+import threading
+import time
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
 import pytesseract
 import cv2
+import numpy as np
+
+from core.ocr_cache import OCRCropCache
+
+try:
+    import tesserocr
+except ImportError:  # 선택 의존성: 없으면 pytesseract 백엔드로 동작
+    tesserocr = None
+
+
+@dataclass(frozen=True)
+class TessConfig:
+    lang: str = "kor+eng"
+    psm: int = 7
+    oem: int = 3
+    whitelist: Optional[str] = None
+
+    def to_args(self) -> str:
+        # pytesseract(명령행)용 설정 문자열
+        args = f"--oem {self.oem} --psm {self.psm}"
+        if self.whitelist:
+            args += f" -c tessedit_char_whitelist={self.whitelist}"
+        return f"{args} -l {self.lang}"
+
+
+class OCRResult(NamedTuple):
+    text: str
+    confidence: float  # 0~100, 단어 신뢰도의 글자 수 가중 평균 (인식된 글자가 없으면 0)
+
+
+class PytesseractBackend:
+    """ROI마다 tesseract 실행 파일을 호출하는 기본(폴백) 백엔드"""
+
+    name = "pytesseract"
+
+    def __init__(self, tesseract_cmd: str):
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    def image_to_string(self, img, config: TessConfig) -> str:
+        return pytesseract.image_to_string(img, config=config.to_args())
+
+    def image_to_data(self, img, config: TessConfig) -> List[Dict[str, Any]]:
+        data = pytesseract.image_to_data(
+            img, config=config.to_args(), output_type=pytesseract.Output.DICT
+        )
+
+        words = []
+        for i, text in enumerate(data["text"]):
+            if not text or not text.strip():
+                continue
+            words.append(
+                {
+                    "text": text,
+                    "conf": float(data["conf"][i]),
+                    "left": data["left"][i],
+                    "top": data["top"][i],
+                    "width": data["width"][i],
+                    "height": data["height"][i],
+                    "line": (
+                        data["block_num"][i],
+                        data["par_num"][i],
+                        data["line_num"][i],
+                    ),
+                }
+            )
+        return words
+
+    def release_thread(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TesserocrBackend:
+    """언어/설정 조합별 Tesseract 인스턴스를 메모리에 유지하는 상주형 백엔드"""
+
+    name = "tesserocr"
+
+    def __init__(self, tessdata_path: str):
+        self.tessdata_path = tessdata_path
+        # TessBaseAPI는 스레드 안전하지 않으므로 스레드별로 인스턴스를 둔다
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all_apis = []
+
+    def _get_api(self, config: TessConfig):
+        apis: Dict[TessConfig, "tesserocr.PyTessBaseAPI"] = getattr(
+            self._local, "apis", None
+        )
+        if apis is None:
+            apis = self._local.apis = {}
+
+        api = apis.get(config)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(
+                path=self.tessdata_path,
+                lang=config.lang,
+                oem=config.oem,
+                psm=config.psm,
+            )
+            if config.whitelist:
+                api.SetVariable("tessedit_char_whitelist", config.whitelist)
+
+            apis[config] = api
+            with self._lock:
+                self._all_apis.append(api)
+        return api
+
+    def _set_image(self, api, img):
+        # 전처리 결과(1채널 uint8)를 PIL 변환 없이 바로 넘긴다
+        if len(img.shape) == 3:
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        height, width = img.shape[:2]
+        api.SetImageBytes(img.tobytes(), width, height, 1, width)
+
+    def image_to_string(self, img, config: TessConfig) -> str:
+        api = self._get_api(config)
+        self._set_image(api, img)
+        return api.GetUTF8Text()
+
+    def image_to_data(self, img, config: TessConfig) -> List[Dict[str, Any]]:
+        api = self._get_api(config)
+        self._set_image(api, img)
+        api.Recognize()
+
+        words = []
+        line_no = 0
+        iterator = api.GetIterator()
+        if iterator is None:
+            # 인식된 영역이 없으면 반복자가 없다
+            return words
+        level = tesserocr.RIL.WORD
+
+        for word in tesserocr.iterate_level(iterator, level):
+            if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line_no += 1
+
+            text = word.GetUTF8Text(level)
+            if not text or not text.strip():
+                continue
+
+            x1, y1, x2, y2 = word.BoundingBox(level)
+            words.append(
+                {
+                    "text": text,
+                    "conf": word.Confidence(level),
+                    "left": x1,
+                    "top": y1,
+                    "width": x2 - x1,
+                    "height": y2 - y1,
+                    "line": (0, 0, line_no),
+                }
+            )
+        return words
+
+    def release_thread(self):
+        # 현재 스레드의 인스턴스만 해제 (배치 스레드가 끝날 때 모델 메모리 반환)
+        apis = getattr(self._local, "apis", None) or {}
+        with self._lock:
+            for api in apis.values():
+                api.End()
+                self._all_apis.remove(api)
+        self._local.apis = {}
+
+    def close(self):
+        with self._lock:
+            for api in self._all_apis:
+                api.End()
+            self._all_apis = []
+        self._local = threading.local()
 
 
 class OCREngine:
     _instance = None
 
+    # 페이지 합성(montage) 설정
+    MONTAGE_PAD = 20  # 좌우/상하 여백(px)
+    MONTAGE_GAP = 60  # ROI 사이 간격(px)
+    MONTAGE_MAX_HEIGHT = 30000  # Tesseract 최대 이미지 크기(32767) 이하
+    MONTAGE_PSM = 4  # 크기가 다른 여러 줄로 이루어진 단일 컬럼
+
+    # 전처리 배율: 글자 높이를 측정하여 목표 높이에 맞춘다 (ROI 크기와 무관하게 일정한 인식 시간)
+    GLYPH_TARGET_HEIGHT = 32  # 확대/축소 후 글자 높이(px)
+    GLYPH_MIN_HEIGHT = 4  # 원본에서 이보다 낮은 성분은 잡티로 보고 측정에서 제외
+    GLYPH_PERCENTILE = 75  # 한글 자모처럼 나뉜 성분보다 전체 글자 높이에 가깝도록
+    MIN_SCALE = 0.5
+    MAX_SCALE = 4.0
+    FALLBACK_SCALE = 3.0  # 글자를 찾지 못한 경우 (기존 고정 배율)
+
+    # 신뢰도 기반 단계적 인식: 기본 전처리 결과의 신뢰도가 낮은 칸만 다시 인식
+    ESCALATE_CONFIDENCE = 70.0
+    ESCALATION_PSMS = (
+        None,
+        6,
+    )  # 무거운 전처리 후 시도할 PSM (None이면 dtype 설정 그대로)
+    HEAVY_GLYPH_HEIGHT = 48  # 무거운 전처리의 목표 글자 높이(px)
+
+    # 표 테두리 제거 (ROI의 remove_lines): 글자 높이의 몇 배 이상 이어진 획을 선으로 본다
+    LINE_H_FACTOR = 3.0  # 가로 선 최소 길이 (글자 높이 배수)
+    LINE_V_FACTOR = 1.5  # 세로 선 최소 길이 (글자 높이 배수)
+
+    # 빈 칸 판정 (전처리 결과 기준이므로 글자 높이가 GLYPH_TARGET_HEIGHT인 픽셀 단위)
+    # 글자 성분의 잉크 비율이 BLANK_MIN_INK보다 작으면 빈 칸 (dtype별로 서식에서 변경)
+    BLANK_MIN_INK = 0.0005
+    BLANK_RESULT = OCRResult("", 100.0)  # 빈 칸으로 판정한 결과
+    BLANK_MIN_HEIGHT = 12  # 글자로 볼 최소 성분 높이
+    BLANK_MIN_AREA = 20  # 글자로 볼 최소 성분 면적 (잡티 제외)
+    BLANK_LINE_RATIO = 15  # 가로/세로 비가 이보다 크면 표 선으로 보고 제외
+    BLANK_SPAN = 0.9  # crop 폭의 이 비율 이상을 가로지르는 성분(테두리)은 제외
+
+    ENGLISH = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    NUMBERS = "0123456789"
+    SYMBOLS = r"!@#$%^&*()-_=+[{]};:'\",<.>/? "
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(OCREngine, cls).__new__(cls)
@@ -20,30 +235,93 @@ class OCREngine:
         self.tesseract_cmd = self._get_tesseract_path()
         pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
         self.default_config = r"--oem 3 --psm 6 -l kor+eng"
+        self.backend = self._create_backend()
+        # 같은 전처리 결과(crop)는 다시 인식하지 않음
+        self.crop_cache = OCRCropCache()
+        self.blank_skipped = 0  # 빈 칸으로 판정하여 인식을 생략한 crop 수
+        self.escalated = 0  # 신뢰도가 낮아 다시 인식한 crop 수
         self._initialized = True
 
-    def _get_tesseract_path(self):
+    def _get_base_path(self) -> Path:
         if getattr(sys, "frozen", False):
-            base_path = Path(sys._MEIPASS)
-        else:
-            base_path = Path(__file__).resolve().parent.parent
+            return Path(sys._MEIPASS)
+        return Path(__file__).resolve().parent.parent
 
-        exe_path = base_path / "tesseract_bin" / "tesseract.exe"
+    def _get_tesseract_path(self):
+        exe_path = self._get_base_path() / "tesseract_bin" / "tesseract.exe"
         return str(exe_path)
 
-    def _preprocess_roi_for_ocr(self, roi_img):
+    def _get_tessdata_path(self) -> Path:
+        return self._get_base_path() / "tesseract_bin" / "tessdata"
+
+    def _create_backend(self, name: str = "auto"):
+        # auto: tesserocr 사용이 가능하면 상주형, 아니면 pytesseract
+        if name in ("auto", TesserocrBackend.name) and tesserocr is not None:
+            tessdata_path = self._get_tessdata_path()
+            if tessdata_path.exists():
+                return TesserocrBackend(str(tessdata_path))
+            if name == TesserocrBackend.name:
+                print(f"[WARNING] tessdata 경로가 없습니다: {tessdata_path}")
+
+        return PytesseractBackend(self.tesseract_cmd)
+
+    def release_thread(self):
+        # 작업 스레드 종료 전에 호출 (스레드별 Tesseract 인스턴스 해제)
+        self.backend.release_thread()
+
+    def set_backend(self, name: str) -> str:
+        if self.backend.name != name:
+            self.backend.close()
+            self.backend = self._create_backend(name)
+        return self.backend.name
+
+    def estimate_glyph_height(self, gray: np.ndarray) -> Optional[float]:
+        """crop의 글자 높이(px) - Otsu 이진화 후 연결 성분 높이로 추정 (글자가 없으면 None)"""
+        _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        _, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+        widths = stats[1:, cv2.CC_STAT_WIDTH]
+        heights = stats[1:, cv2.CC_STAT_HEIGHT]
+
+        # 잡티, 표 선, 칸 테두리/배경 음영(crop 폭 전체를 덮는 성분)은 제외
+        glyphs = (
+            (heights >= self.GLYPH_MIN_HEIGHT)
+            & (
+                np.maximum(widths, heights)
+                <= self.BLANK_LINE_RATIO * np.minimum(widths, heights)
+            )
+            & (widths < gray.shape[1] * self.BLANK_SPAN)
+        )
+        if not glyphs.any():
+            return None
+        return float(np.percentile(heights[glyphs], self.GLYPH_PERCENTILE))
+
+    def ocr_scale(
+        self, gray: np.ndarray, target_height: Optional[int] = None
+    ) -> Tuple[float, float]:
+        """(확대 배율, 확대 후 글자 높이) - 글자 높이를 모르면 목표 높이로 간주"""
+        target_height = target_height or self.GLYPH_TARGET_HEIGHT
+        glyph_height = self.estimate_glyph_height(gray)
+        if glyph_height is None:
+            return self.FALLBACK_SCALE, float(target_height)
+        scale = min(self.MAX_SCALE, max(self.MIN_SCALE, target_height / glyph_height))
+        return scale, glyph_height * scale
+
+    def _preprocess_roi_for_ocr(self, roi_img, remove_lines: bool = False):
         if len(roi_img.shape) == 3:
             gray = cv2.cvtColor(roi_img, cv2.COLOR_BGR2GRAY)
         else:
             gray = roi_img
 
-        # 확대
-        scale_percent = 300
-        width = int(gray.shape[1] * scale_percent / 100)
-        height = int(gray.shape[0] * scale_percent / 100)
-
-        # 보간
-        resized = cv2.resize(gray, (width, height), interpolation=cv2.INTER_CUBIC)
+        # 글자 높이에 맞춘 확대/축소 (이미 충분히 큰 글자는 그대로 또는 축소)
+        scale, glyph_height = self.ocr_scale(gray)
+        if abs(scale - 1.0) < 0.1:
+            resized = gray
+            glyph_height /= scale
+        else:
+            width = max(1, int(gray.shape[1] * scale))
+            height = max(1, int(gray.shape[0] * scale))
+            interpolation = cv2.INTER_CUBIC if scale > 1.0 else cv2.INTER_AREA
+            resized = cv2.resize(gray, (width, height), interpolation=interpolation)
         # _, binary = cv2.threshold(resized, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
         # return binary
 
@@ -62,43 +340,380 @@ class OCREngine:
         opening = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
         closing = cv2.morphologyEx(opening, cv2.MORPH_CLOSE, kernel)
 
+        if remove_lines:
+            return self._remove_lines(closing, glyph_height)
         return closing
 
-    def extract_text_from_roi(self, image, x, y, w, h, dtype="전체"):
+    def _preprocess_roi_heavy(self, roi_img, remove_lines: bool = False):
+        # 신뢰도가 낮은 칸용: 더 크게 확대 -> 잡음 제거 -> Otsu 이진화 -> 끊어진 획 잇기
+        if len(roi_img.shape) == 3:
+            gray = cv2.cvtColor(roi_img, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = roi_img
+
+        scale, glyph_height = self.ocr_scale(gray, self.HEAVY_GLYPH_HEIGHT)
+        resized = cv2.resize(
+            gray,
+            (max(1, int(gray.shape[1] * scale)), max(1, int(gray.shape[0] * scale))),
+            interpolation=cv2.INTER_CUBIC if scale > 1.0 else cv2.INTER_AREA,
+        )
+        denoised = cv2.fastNlMeansDenoising(resized, None, h=15)
+        _, binary = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+        # 흰 바탕 검은 글자이므로 열림 연산이 검은 획을 잇는다
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+        repaired = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
+
+        if remove_lines:
+            return self._remove_lines(repaired, glyph_height)
+        return repaired
+
+    def _remove_lines(self, binary: np.ndarray, glyph_height: float) -> np.ndarray:
+        """
+        이진 이미지(흰 바탕 검은 글자)에서 긴 가로/세로 획(표 테두리)을 지운다.
+        ROI에 걸친 칸 테두리가 |, _ 같은 문자로 인식되거나 배치 분석을 늘리지 않도록
+        """
+        ink = cv2.bitwise_not(binary)
+        h_len = max(2, int(glyph_height * self.LINE_H_FACTOR))
+        v_len = max(2, int(glyph_height * self.LINE_V_FACTOR))
+
+        lines = np.zeros_like(ink)
+        for size in ((h_len, 1), (1, v_len)):
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, size)
+            lines |= cv2.morphologyEx(ink, cv2.MORPH_OPEN, kernel)
+        if not lines.any():
+            return binary
 
-        numbers = "0123456789"
-        symbols = r"!@#$%^&*()-_=+[{]};:'\",<.>/? "
+        # 선 가장자리의 번진 부분까지 지우도록 조금 두껍게
+        lines = cv2.dilate(lines, np.ones((3, 3), np.uint8))
+        cleaned = binary.copy()
+        cleaned[lines > 0] = 255
+        return cleaned
 
+    def get_config(self, dtype: str = "전체") -> TessConfig:
         if dtype == "숫자":
             # 숫자 + 기본 기호 (7을 /로 오해하는 것을 방지)
-            whitelist = numbers + ".,/@- "
-            config = f"--oem 3 --psm 7 -c tessedit_char_whitelist={whitelist} -l eng"
+            return TessConfig(lang="eng", whitelist=self.NUMBERS + ".,/@- ")
 
         elif dtype == "영어+숫자":
-            english = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-            whitelist = english + numbers + symbols
-            config = f"--oem 3 --psm 7 -c tessedit_char_whitelist={whitelist} -l eng"
+            whitelist = self.ENGLISH + self.NUMBERS + self.SYMBOLS
+            return TessConfig(lang="eng", whitelist=whitelist)
 
         elif dtype == "한글":
-            config = "--oem 3 --psm 7 -l kor"  # 한글은 화이트리스트 관리가 어려우니 언어팩 최적화
+            # 한글은 화이트리스트 관리가 어려우니 언어팩 최적화
+            return TessConfig(lang="kor")
 
         elif dtype == "영어":
-            english = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-            whitelist = english + symbols
-            config = f"--oem 3 --psm 7 -c tessedit_char_whitelist={whitelist} -l eng"
+            return TessConfig(lang="eng", whitelist=self.ENGLISH + self.SYMBOLS)
 
-        else:
-            config = "--oem 3 --psm 7 -l kor+eng"
+        return TessConfig(lang="kor+eng")
+
+    @classmethod
+    def get_blank_threshold(cls, profile_data: Optional[Dict], dtype: str) -> float:
+        # 서식의 dtype별 빈 칸 기준 (없으면 기본값, 0이면 판정하지 않음)
+        thresholds = (profile_data or {}).get("blank_thresholds") or {}
+        return float(thresholds.get(dtype, cls.BLANK_MIN_INK))
+
+    def is_blank(self, processed: np.ndarray, min_ink: float) -> bool:
+        """전처리 결과(흰 바탕 검은 글자)에 글자로 볼 연결 성분이 충분하지 않으면 True"""
+        if min_ink <= 0:
+            return False
 
+        ink = cv2.bitwise_not(processed)
+        _, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+        widths = stats[1:, cv2.CC_STAT_WIDTH]
+        heights = stats[1:, cv2.CC_STAT_HEIGHT]
+        areas = stats[1:, cv2.CC_STAT_AREA]
+
+        # 잡티, 표 선, 칸 테두리를 뺀 성분의 잉크만 센다
+        text_like = (
+            (heights >= self.BLANK_MIN_HEIGHT)
+            & (areas >= self.BLANK_MIN_AREA)
+            & (
+                np.maximum(widths, heights)
+                <= self.BLANK_LINE_RATIO * np.minimum(widths, heights)
+            )
+            & (widths < processed.shape[1] * self.BLANK_SPAN)
+        )
+        return areas[text_like].sum() < min_ink * processed.size
+
+    def skip_blank(self, processed: np.ndarray, profile_data, dtype: str) -> bool:
+        if self.is_blank(processed, self.get_blank_threshold(profile_data, dtype)):
+            self.blank_skipped += 1
+            return True
+        return False
+
+    def stats(self) -> Dict[str, float]:
+        # crop 캐시 통계 + 빈 칸 생략 수
+        return {
+            **self.crop_cache.stats(),
+            "blank_skipped": self.blank_skipped,
+            "escalated": self.escalated,
+        }
+
+    @staticmethod
+    def clamp_rect(image, x, y, w, h) -> Tuple[int, int, int, int]:
         h_img, w_img = image.shape[:2]
         x = max(0, min(x, w_img - 1))
         y = max(0, min(y, h_img - 1))
         w = max(1, min(w, w_img - x))
         h = max(1, min(h, h_img - y))
+        return x, y, w, h
 
-        roi = image[y : y + h, x : x + w]
-        processed_roi = self._preprocess_roi_for_ocr(roi)
-        # custom_config = r"--oem 3 --psm 7 -l kor+eng"
-
-        text = pytesseract.image_to_string(processed_roi, config=config)
+    @staticmethod
+    def _clean_text(text: str) -> str:
         return text.strip().replace(" ", "")
+
+    def clean_layer_text(self, text: str, dtype: str = "전체") -> str:
+        # PDF 텍스트 레이어 문자열을 OCR 결과와 같은 형태로 정리
+        whitelist = self.get_config(dtype).whitelist
+        if whitelist:
+            text = "".join(c for c in text if c in whitelist)
+        return self._clean_text(text)
+
+    @staticmethod
+    def line_removal_rois(profile_data: Optional[Dict]) -> set:
+        # 표 테두리 제거를 켠 ROI의 컬럼 이름
+        return {
+            roi["col_name"]
+            for roi in (profile_data or {}).get("rois", [])
+            if roi.get("remove_lines")
+        }
+
+    def recognize_roi(
+        self,
+        crop: np.ndarray,
+        dtype: str = "전체",
+        profile_data=None,
+        remove_lines: bool = False,
+    ) -> OCRResult:
+        """
+        잘라낸 ROI 한 칸을 인식한다.
+        기본 전처리로 먼저 인식하고, 신뢰도가 낮을 때만 무거운 전처리/다른 PSM으로 다시 인식
+        remove_lines : 표 테두리(긴 가로/세로 획)를 지우고 인식
+        """
+        config = self.get_config(dtype)
+        processed = self._preprocess_roi_for_ocr(crop, remove_lines)
+        if self.skip_blank(processed, profile_data, dtype):
+            return self.BLANK_RESULT
+
+        key = self.crop_cache.make_key(processed, config, self.backend.name)
+        cached = self.crop_cache.get(key)
+        if cached is not None:
+            return OCRResult(*cached)
+
+        started = time.perf_counter()
+        result = self._words_result(self.backend.image_to_data(processed, config))
+        result = self._escalate(crop, config, result, remove_lines)
+        self.crop_cache.put(key, result, time.perf_counter() - started)
+        return result
+
+    def extract_text_from_roi(self, image, x, y, w, h, dtype="전체", profile_data=None):
+        x, y, w, h = self.clamp_rect(image, x, y, w, h)
+        crop = image[y : y + h, x : x + w]
+        return self.recognize_roi(crop, dtype, profile_data).text
+
+    def extract_crops_texts(
+        self, roi_crops: Sequence[Tuple], profile_data: Optional[Dict] = None
+    ) -> Dict[str, str]:
+        results = self.extract_crops_results(roi_crops, profile_data)
+        return {col_name: result.text for col_name, result in results.items()}
+
+    def extract_crops_results(
+        self, roi_crops: Sequence[Tuple], profile_data: Optional[Dict] = None
+    ) -> Dict[str, OCRResult]:
+        """
+        roi_crops : [(col_name, crop, dtype), ...] (잘라낸 ROI 이미지)
+        같은 dtype의 ROI끼리 한 장으로 합성하여 한 번에 인식한다.
+        profile_data : 빈 칸 기준(blank_thresholds)과 ROI별 테두리 제거를 읽을 서식
+        """
+        line_rois = self.line_removal_rois(profile_data)
+        groups: Dict[Tuple[str, bool], List[Tuple[str, np.ndarray]]] = {}
+        for col_name, crop, dtype in roi_crops:
+            key = (dtype, col_name in line_rois)
+            groups.setdefault(key, []).append((col_name, crop))
+
+        results = {}
+        for (dtype, remove_lines), items in groups.items():
+            group_results = self.recognize_crops(
+                [crop for _, crop in items], dtype, profile_data, remove_lines
+            )
+            for (col_name, _), result in zip(items, group_results):
+                results[col_name] = result
+
+        return results
+
+    def recognize_crops(
+        self,
+        crops: Sequence[np.ndarray],
+        dtype: str = "전체",
+        profile_data=None,
+        remove_lines: bool = False,
+    ) -> List[OCRResult]:
+        """잘라낸 ROI들(같은 dtype)을 전처리 -> 빈 칸 제외 -> 합성 인식 (crop 순서대로)"""
+        results = [self.BLANK_RESULT] * len(crops)
+        filled, processed = [], []
+        for i, crop in enumerate(crops):
+            image = self._preprocess_roi_for_ocr(crop, remove_lines)
+            if not self.skip_blank(image, profile_data, dtype):
+                filled.append(i)
+                processed.append(image)
+
+        filled_results = self.recognize_montage(
+            processed,
+            self.get_config(dtype),
+            originals=[crops[i] for i in filled],
+            remove_lines=remove_lines,
+        )
+        for i, result in zip(filled, filled_results):
+            results[i] = result
+        return results
+
+    def recognize_montage(
+        self,
+        crops: Sequence[np.ndarray],
+        config: TessConfig,
+        originals: Optional[Sequence[np.ndarray]] = None,
+        remove_lines: bool = False,
+    ) -> List[OCRResult]:
+        """
+        전처리된 crop들을 세로로 쌓아 인식하고, crop 순서대로 결과를 돌려준다.
+        캐시에 있는 crop과 같은 호출 안의 중복 crop은 합성에서 뺀다.
+        originals : 전처리 전 crop (있으면 신뢰도가 낮은 칸만 따로 다시 인식)
+        """
+        montage_config = replace(config, psm=self.MONTAGE_PSM)
+        keys = [
+            self.crop_cache.make_key(crop, montage_config, self.backend.name)
+            for crop in crops
+        ]
+        known = {
+            key: OCRResult(*value)
+            for key, value in self.crop_cache.get_many(keys).items()
+        }
+
+        # 인식할 crop (같은 키는 처음 것만)
+        first: Dict[str, int] = {}
+        for i, key in enumerate(keys):
+            if key not in known and key not in first:
+                first[key] = i
+        pending = list(first.values())
+
+        if pending:
+            started = time.perf_counter()
+            pending_results = self._recognize_montage(
+                [crops[i] for i in pending], montage_config
+            )
+            if originals is not None:
+                pending_results = [
+                    self._escalate(originals[i], config, result, remove_lines)
+                    for i, result in zip(pending, pending_results)
+                ]
+            self.crop_cache.put_many(
+                [(keys[i], result) for i, result in zip(pending, pending_results)],
+                time.perf_counter() - started,
+            )
+            for i, result in zip(pending, pending_results):
+                known[keys[i]] = result
+
+        return [known[key] for key in keys]
+
+    def _recognize_montage(
+        self, crops: Sequence[np.ndarray], montage_config: TessConfig
+    ) -> List[OCRResult]:
+        results = [self._words_result([])] * len(crops)
+        for indices in self._split_montage_chunks(crops):
+            montage, slot_tops = self._build_montage([crops[i] for i in indices])
+            words = self.backend.image_to_data(montage, montage_config)
+
+            slot_words: Dict[int, List[Dict[str, Any]]] = {}
+            for word in words:
+                # 단어 중심이 속한 칸(slot) 찾기
+                center_y = word["top"] + word["height"] / 2
+                slot = bisect.bisect_right(slot_tops, center_y) - 1
+                if slot < 0:
+                    continue
+                slot_words.setdefault(slot, []).append(word)
+
+            for slot, items in slot_words.items():
+                results[indices[slot]] = self._words_result(items)
+
+        return results
+
+    def _words_result(self, words: Sequence[Dict[str, Any]]) -> OCRResult:
+        # 단어들을 줄/위치 순으로 이어 붙이고, 신뢰도는 글자 수 가중 평균 (단어가 없으면 0)
+        words = sorted(words, key=lambda wd: (wd["line"], wd["left"]))
+        text = self._clean_text("".join(wd["text"] for wd in words))
+
+        weights = [len(wd["text"].strip()) for wd in words]
+        if not text or not sum(weights):
+            return OCRResult(text, 0.0)
+
+        confidence = sum(
+            max(0.0, float(wd["conf"])) * weight for wd, weight in zip(words, weights)
+        )
+        return OCRResult(text, confidence / sum(weights))
+
+    def _escalate(
+        self,
+        crop: np.ndarray,
+        config: TessConfig,
+        result: OCRResult,
+        remove_lines: bool = False,
+    ) -> OCRResult:
+        # 신뢰도가 기준보다 낮으면 무거운 전처리 후 PSM을 바꿔 가며 다시 인식 (가장 높은 신뢰도 사용)
+        if result.confidence >= self.ESCALATE_CONFIDENCE:
+            return result
+
+        self.escalated += 1
+        heavy = self._preprocess_roi_heavy(crop, remove_lines)
+        for psm in self.ESCALATION_PSMS:
+            step_config = replace(config, psm=psm) if psm else config
+            candidate = self._words_result(
+                self.backend.image_to_data(heavy, step_config)
+            )
+            if candidate.confidence > result.confidence:
+                result = candidate
+            if result.confidence >= self.ESCALATE_CONFIDENCE:
+                break
+        return result
+
+    def _split_montage_chunks(self, crops: Sequence[np.ndarray]) -> List[List[int]]:
+        # 최대 높이를 넘지 않도록 순서대로 채워 넣는다
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        height = self.MONTAGE_PAD * 2
+
+        for i, crop in enumerate(crops):
+            needed = crop.shape[0] + self.MONTAGE_GAP
+            if current and height + needed > self.MONTAGE_MAX_HEIGHT:
+                chunks.append(current)
+                current = []
+                height = self.MONTAGE_PAD * 2
+            current.append(i)
+            height += needed
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _build_montage(self, crops: Sequence[np.ndarray]):
+        """
+        반환값 : 합성 이미지, 각 칸의 시작 y좌표 목록
+        칸의 경계는 crop 사이 간격의 중간으로 잡는다.
+        """
+        pad, gap = self.MONTAGE_PAD, self.MONTAGE_GAP
+        width = max(crop.shape[1] for crop in crops) + pad * 2
+        height = sum(crop.shape[0] for crop in crops) + gap * (len(crops) - 1)
+        height += pad * 2
+
+        montage = np.full((height, width), 255, dtype=np.uint8)
+        slot_tops = []
+
+        y = pad
+        for i, crop in enumerate(crops):
+            crop_h, crop_w = crop.shape[:2]
+            montage[y : y + crop_h, pad : pad + crop_w] = crop
+            slot_tops.append(0 if i == 0 else y - gap // 2)
+            y += crop_h + gap
+
+        return montage, slot_tops
@@ -0,0 +1,584 @@
+import json
+import multiprocessing as mp
+import queue
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.ocr_engine import OCREngine
+from core.image_loader import ImageLoader
+from core.image_aligner import ImageAligner
+from core.image_cache import ImageCache
+from core.form_classifier import FormClassifier
+
+
+class StageError(Exception):
+    """단계 처리 실패 (로그에 그대로 표시할 메시지를 담는다)"""
+
+
+# 문서 처리 단계: 로드 -> 정렬 -> OCR
+# 각 단계는 task(dict)를 받아 필요한 값을 채워 돌려준다.
+# 순차 처리(BatchProcessor)와 프로세스 파이프라인이 같은 함수를 사용한다.
+
+
+def make_task(
+    index: int,
+    file_path: Path,
+    profile_name: str,
+    profile_data: Dict,
+    page_mode: bool = False,
+    options: Optional[Dict[str, Any]] = None,
+    page: int = 0,
+    page_count: int = 1,
+) -> Dict[str, Any]:
+    return {
+        "index": index,
+        "path": str(file_path),
+        "page": page,  # 여러 페이지 파일의 페이지 번호 (0부터)
+        "page_count": page_count,
+        "profile_name": profile_name,
+        "profile_data": profile_data,
+        "page_mode": page_mode,
+        "options": options or {},
+        "image": None,
+        "pdf_words": None,  # PDF 텍스트 레이어 (있으면 렌더링/정렬/OCR 생략)
+        "render_dpi": None,  # PDF를 정렬용 저해상도로 변환한 경우 그 해상도
+        "matrix": None,  # ROI 단위 변환용 (None이면 image가 이미 정렬됨)
+        "template_shape": None,
+        "align": None,
+        "classify": None,  # 내용으로 서식을 고른 경우 분류 점수
+        "cached": {},  # 이전 실행에서 재사용하는 ROI 결과 {컬럼 이름: 값}
+        "cached_confidence": {},  # 재사용하는 ROI의 인식 신뢰도 {컬럼 이름: 신뢰도}
+        "reused": False,  # 모든 ROI를 이전 결과로 채운 task (로드/정렬/OCR 생략)
+        "row_data": None,  # 미리 채워져 있으면(모든 ROI 재사용) 이후 단계 생략
+        "ocr_stats": None,  # OCR 단계의 crop 캐시/빈 칸 생략 통계 변화량 (OCREngine.stats)
+        "error": None,
+    }
+
+
+def document_name(task: Dict[str, Any]) -> str:
+    # 여러 페이지 파일은 페이지마다 별도 문서: "파일명#페이지"
+    name = Path(task["path"]).name
+    if task["page_count"] > 1:
+        return f"{name}#{task['page'] + 1}"
+    return name
+
+
+def _load_args(path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    # ImageLoader.iter_pages / load_page 인자
+    args = {
+        "pdf_dpi": None,
+        "pdf_text": False,
+        "grayscale": bool(options.get("grayscale")),  # 1채널로 디코딩
+    }
+    if path.lower().endswith(".pdf"):
+        # PDF ROI 변환: 페이지는 정렬용 저해상도로만 변환하고 ROI는 나중에 고해상도로
+        if options.get("pdf_clip"):
+            args["pdf_dpi"] = ImageLoader.PDF_ALIGN_DPI
+        args["pdf_text"] = bool(options.get("pdf_text"))
+    return args
+
+
+def _set_loaded_page(task: Dict[str, Any], img, words, pdf_dpi) -> Dict[str, Any]:
+    # 텍스트 레이어가 있는 PDF 페이지는 이미지로 변환하지 않음
+    if words is not None:
+        task["pdf_words"] = words
+        return task
+
+    if img is None:
+        raise StageError(f"[ERROR] 이미지 로드 실패: {document_name(task)}")
+
+    task["image"] = img
+    task["render_dpi"] = pdf_dpi
+    return task
+
+
+def load_stage(task: Dict[str, Any]) -> Dict[str, Any]:
+    if task["row_data"] is not None:
+        return task
+
+    load_args = _load_args(task["path"], task["options"])
+    img, words = ImageLoader.load_page(task["path"], task["page"], **load_args)
+    return _set_loaded_page(task, img, words, load_args["pdf_dpi"])
+
+
+def iter_page_tasks(
+    index: int,
+    file_path: Path,
+    profile_name: str,
+    profile_data: Dict,
+    page_mode: bool = False,
+    options: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    파일을 한 번만 열고 페이지를 하나씩 읽어 로드가 끝난 task를 돌려준다.
+    (순차 처리용: 수백 페이지 묶음도 메모리에는 한 페이지만 유지)
+    로드에 실패한 페이지는 task["error"]에 메시지를 담는다.
+    """
+    options = options or {}
+    page_count = ImageLoader.count_pages(file_path)
+    load_args = _load_args(str(file_path), options)
+
+    pages = ImageLoader.iter_pages(file_path, **load_args)
+    for page, img, words in pages:
+        task = make_task(
+            index,
+            file_path,
+            profile_name,
+            profile_data,
+            page_mode,
+            options,
+            page=page,
+            page_count=page_count,
+        )
+
+        try:
+            task = _set_loaded_page(task, img, words, load_args["pdf_dpi"])
+        except StageError as e:
+            task["error"] = str(e)
+        yield task
+
+
+def _use_roi_warp(task: Dict[str, Any]) -> bool:
+    # 저해상도 PDF 페이지는 변환하지 않고 행렬만 사용
+    return task["options"].get("roi_warp", False) or bool(task["render_dpi"])
+
+
+def _set_align_result(task: Dict[str, Any], result) -> Dict[str, Any]:
+    if result.ok and _use_roi_warp(task):
+        # 페이지 전체 변환 없이 행렬만 넘기고 ROI 단위로 변환
+        task["matrix"] = result.matrix
+        task["template_shape"] = result.template_shape
+    elif result.ok:
+        task["image"] = result.image
+
+    # 정렬 정보 (로그/결과 기록용, 이미지 제외)
+    task["align"] = {
+        "ok": result.ok,
+        "method": result.method,
+        "elapsed": result.elapsed,
+        "inlier_ratio": result.inlier_ratio,
+        "residual": result.residual,
+        "matrix": result.matrix,
+        "template_shape": result.template_shape,
+    }
+    return task
+
+
+def classify_stage(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    서식이 정해지지 않은 task(profile_data None)를 페이지 내용으로 분류하고,
+    분류에 쓴 매칭으로 바로 정렬한다.
+    후보 서식 : task["options"]["classify_profiles"]
+    """
+    name = document_name(task)
+    if task["pdf_words"] is not None:
+        raise StageError(f"[SKIP] 서식 분류 실패: {name} (텍스트 레이어 PDF)")
+
+    profiles = task["options"].get("classify_profiles") or {}
+    found = FormClassifier().classify(task["image"], profiles)
+    if found is None:
+        raise StageError(f"[SKIP] 서식 분류 실패: {name}")
+
+    task["profile_name"] = found.profile_name
+    task["profile_data"] = profiles[found.profile_name]
+    task["classify"] = {
+        "score": found.score,
+        "votes": found.votes,
+        "runner_up_votes": found.runner_up_votes,
+    }
+
+    # 분류 색인은 피라미드 특징점이므로 같은 특징점으로 정렬
+    result = ImageAligner.align(
+        task["image"],
+        task["profile_data"]["template_path"],
+        pyramid=True,
+        warp=not _use_roi_warp(task),
+        matches=found.matches,
+        **ImageAligner.get_profile_settings(task["profile_data"]),
+    )
+    return _set_align_result(task, result)
+
+
+def align_stage(task: Dict[str, Any]) -> Dict[str, Any]:
+    if task["row_data"] is not None:
+        return task
+
+    if task["profile_data"] is None:
+        return classify_stage(task)
+
+    if task["pdf_words"] is not None:
+        return task
+
+    template_path = task["profile_data"].get("template_path", "")
+    if template_path and Path(template_path).exists():
+        result = ImageAligner.align(
+            task["image"],
+            template_path,
+            pyramid=task["options"].get("pyramid", False),
+            warp=not _use_roi_warp(task),
+            fast_check=task["options"].get("fast_check", False),
+            **ImageAligner.get_profile_settings(task["profile_data"]),
+        )
+        _set_align_result(task, result)
+
+    return task
+
+
+def get_roi_boxes(rois: List[Dict], curr_w: int, curr_h: int) -> List[tuple]:
+    # 비율 -> 픽셀 좌표: (col_name, x, y, w, h, dtype)
+    return [
+        (
+            roi["col_name"],
+            int(roi["x"] * curr_w),
+            int(roi["y"] * curr_h),
+            int(roi["w"] * curr_w),
+            int(roi["h"] * curr_h),
+            roi.get("dtype", "전체"),
+        )
+        for roi in rois
+    ]
+
+
+def pending_rois(task: Dict[str, Any]) -> List[Dict]:
+    # 이전 결과를 재사용하지 않는(새로 인식할) ROI
+    return [
+        roi
+        for roi in task["profile_data"].get("rois", [])
+        if roi["col_name"] not in task["cached"]
+    ]
+
+
+def get_roi_crops(task: Dict[str, Any]) -> List[tuple]:
+    """반환값 : [(col_name, crop, dtype), ...] (템플릿 좌표계로 정렬된 ROI 이미지)"""
+    img = task["image"]
+    matrix = task["matrix"]
+    rois = pending_rois(task)
+
+    if task["render_dpi"]:
+        return get_pdf_roi_crops(task, rois)
+
+    if matrix is None:
+        curr_h, curr_w = img.shape[:2]
+        roi_crops = []
+        for col_name, x, y, w, h, dtype in get_roi_boxes(rois, curr_w, curr_h):
+            x, y, w, h = OCREngine.clamp_rect(img, x, y, w, h)
+            roi_crops.append((col_name, img[y : y + h, x : x + w], dtype))
+        return roi_crops
+
+    # ROI 단위 변환: 템플릿 크기 기준 좌표를 바로 변환
+    curr_h, curr_w = task["template_shape"]
+    return [
+        (
+            col_name,
+            ImageAligner.warp_roi(img, matrix, x, y, max(1, w), max(1, h)),
+            dtype,
+        )
+        for col_name, x, y, w, h, dtype in get_roi_boxes(rois, curr_w, curr_h)
+    ]
+
+
+def get_pdf_roi_crops(task: Dict[str, Any], rois: List[Dict]) -> List[tuple]:
+    """PDF에서 ROI 영역만 PDF_DPI로 변환하여 템플릿 좌표계로 정렬"""
+    matrix = task["matrix"]
+    pdf_dpi = ImageLoader.PDF_DPI
+
+    if matrix is None:
+        # 정렬 정보가 없으면 ROI 비율을 페이지에 그대로 적용
+        clips = [
+            (roi["x"], roi["y"], roi["x"] + roi["w"], roi["y"] + roi["h"])
+            for roi in rois
+        ]
+        rendered = ImageLoader.render_pdf_clips(
+            task["path"],
+            clips,
+            relative=True,
+            page_no=task["page"],
+            grayscale=bool(task["options"].get("grayscale")),
+        )
+        return [
+            (
+                roi["col_name"],
+                crop if crop is not None else _blank_crop(task, 1, 1),
+                roi.get("dtype", "전체"),
+            )
+            for roi, (crop, _) in zip(rois, rendered)
+        ]
+
+    # 템플릿 좌표의 ROI 네 모서리 -> 저해상도 페이지 좌표 -> PDF 좌표(pt)
+    to_page = 72.0 / task["render_dpi"]
+    margin = ImageAligner.ROI_WARP_MARGIN
+    inverse = np.linalg.inv(matrix)
+    curr_h, curr_w = task["template_shape"]
+    boxes = get_roi_boxes(rois, curr_w, curr_h)
+
+    clips = []
+    for _, x, y, w, h, _ in boxes:
+        corners = np.float32(
+            [
+                [x - margin, y - margin],
+                [x + w + margin, y - margin],
+                [x - margin, y + h + margin],
+                [x + w + margin, y + h + margin],
+            ]
+        ).reshape(-1, 1, 2)
+        page_pts = cv2.perspectiveTransform(corners, inverse).reshape(-1, 2) * to_page
+        x0, y0 = page_pts.min(axis=0)
+        x1, y1 = page_pts.max(axis=0)
+        clips.append((x0, y0, x1, y1))
+
+    rendered = ImageLoader.render_pdf_clips(
+        task["path"],
+        clips,
+        dpi=pdf_dpi,
+        page_no=task["page"],
+        grayscale=bool(task["options"].get("grayscale")),
+    )
+
+    roi_crops = []
+    for (col_name, x, y, w, h, dtype), (clip_img, origin) in zip(boxes, rendered):
+        w, h = max(1, w), max(1, h)
+        if clip_img is None:
+            roi_crops.append((col_name, _blank_crop(task, w, h), dtype))
+            continue
+
+        # 클립 픽셀 -> 저해상도 페이지 픽셀 -> 템플릿 좌표
+        scale = task["render_dpi"] / pdf_dpi
+        clip_to_page = np.array(
+            [
+                [scale, 0.0, origin[0] * scale],
+                [0.0, scale, origin[1] * scale],
+                [0.0, 0.0, 1.0],
+            ]
+        )
+        roi_crops.append(
+            (
+                col_name,
+                ImageAligner.warp_roi(clip_img, matrix @ clip_to_page, x, y, w, h),
+                dtype,
+            )
+        )
+    return roi_crops
+
+
+def _blank_crop(task: Dict[str, Any], w: int, h: int):
+    # 페이지 밖 ROI는 빈(흰색) 이미지로 대체 (페이지와 같은 채널 수)
+    shape = (h, w) if task["options"].get("grayscale") else (h, w, 3)
+    return np.full(shape, 255, dtype=np.uint8)
+
+
+def full_resolution_matrix(task: Dict[str, Any]) -> Optional[np.ndarray]:
+    """원본 해상도(PDF는 PDF_DPI) 페이지 기준 호모그래피 (정렬하지 않았거나 실패 시 None)"""
+    info = task["align"]
+    if not info or info["matrix"] is None:
+        return None
+
+    matrix = info["matrix"]
+    if task["render_dpi"]:
+        # 저해상도 페이지 기준 행렬 -> PDF_DPI 페이지 기준
+        scale = task["render_dpi"] / ImageLoader.PDF_DPI
+        matrix = matrix @ np.diag([scale, scale, 1.0])
+    return matrix
+
+
+def make_row_data(task: Dict[str, Any]) -> Dict[str, Any]:
+    row_data = {
+        "파일명": document_name(task),
+        "full_path": str(Path(task["path"])),
+    }
+    # 여러 페이지 파일: 검증 화면에서 해당 페이지를 열기 위한 숨김 컬럼
+    if task["page_count"] > 1:
+        row_data["page"] = task["page"] + 1
+
+    # 정렬 결과 숨김 컬럼: 검증 화면이 다시 정합하지 않고 행렬을 그대로 사용
+    info = task["align"]
+    matrix = full_resolution_matrix(task)
+    row_data["align_status"] = (
+        "" if not info else info["method"] if info["ok"] else "failed"
+    )
+    row_data["inlier_ratio"] = round(info["inlier_ratio"], 3) if info else ""
+    row_data["homography"] = (
+        ImageCache.encode_matrix(
+            matrix,
+            info["template_shape"],
+            task["profile_data"].get("template_path", ""),
+        )
+        if matrix is not None
+        else ""
+    )
+    row_data["file_stamp"] = ImageCache.file_stamp(task["path"])
+
+    # ROI 컬럼 자리 (재사용 결과는 바로 채움, 나머지는 인식 후 채워짐)
+    for roi in task["profile_data"].get("rois", []):
+        row_data[roi["col_name"]] = task["cached"].get(roi["col_name"], "")
+    if task["cached_confidence"]:
+        row_data["ocr_confidence"] = json.dumps(
+            task["cached_confidence"], ensure_ascii=False
+        )
+    return row_data
+
+
+# 병렬 OCR 프로세스에서 배치로 넘기는 통계 (OCREngine.stats의 키)
+OCR_STAT_NAMES = ("hits", "misses", "saved_seconds", "blank_skipped", "escalated")
+
+
+def set_confidences(row_data: Dict[str, Any], results: Dict[str, Any]) -> None:
+    # 인식 신뢰도 숨김 컬럼 : {컬럼 이름: 신뢰도} (재사용/텍스트 레이어 값은 없음)
+    confidences = json.loads(row_data.get("ocr_confidence") or "{}")
+    for col_name, result in results.items():
+        confidences[col_name] = round(result.confidence, 1)
+    row_data["ocr_confidence"] = json.dumps(confidences, ensure_ascii=False)
+
+
+def ocr_stage(
+    task: Dict[str, Any], should_stop: Optional[Callable[[], bool]] = None
+) -> Dict[str, Any]:
+    if task["row_data"] is not None:
+        return task
+
+    ocr_engine = OCREngine()
+
+    row_data = make_row_data(task)
+
+    if task["pdf_words"] is not None:
+        # PDF 텍스트 레이어: ROI 비율 영역 안의 단어를 그대로 사용
+        for roi in pending_rois(task):
+            text = ImageLoader.words_in_rect(
+                task["pdf_words"], roi["x"], roi["y"], roi["w"], roi["h"]
+            )
+            row_data[roi["col_name"]] = ocr_engine.clean_layer_text(
+                text, roi.get("dtype", "전체")
+            )
+
+        task["pdf_words"] = []
+        task["row_data"] = row_data
+        return task
+
+    roi_crops = get_roi_crops(task)
+    ocr_engine.crop_cache.open_disk(task["options"].get("ocr_cache"))
+    before = ocr_engine.stats()
+
+    if task["page_mode"]:
+        results = ocr_engine.extract_crops_results(roi_crops, task["profile_data"])
+    else:
+        results = {}
+        line_rois = ocr_engine.line_removal_rois(task["profile_data"])
+        for col_name, crop, dtype in roi_crops:
+            # 중지 요청 시 즉시 중단 (긴 작업 방지)
+            if should_stop and should_stop():
+                return task
+
+            # OCR 엔진 호출
+            results[col_name] = ocr_engine.recognize_roi(
+                crop, dtype, task["profile_data"], col_name in line_rois
+            )
+
+    for col_name, result in results.items():
+        row_data[col_name] = result.text
+    set_confidences(row_data, results)
+
+    after = ocr_engine.stats()
+    task["ocr_stats"] = {name: after[name] - before[name] for name in OCR_STAT_NAMES}
+
+    # 다음 단계로 넘길 필요가 없는 페이지 이미지는 비운다
+    task["image"] = None
+    task["row_data"] = row_data
+    return task
+
+
+def _stage_worker(func: Callable, in_queue, out_queue):
+    while True:
+        task = in_queue.get()
+        if task is None:
+            break
+
+        # 앞 단계에서 실패한 작업은 그대로 통과
+        if task["error"] is None:
+            try:
+                task = func(task)
+            except StageError as e:
+                task["error"] = str(e)
+            except Exception as e:
+                task["error"] = f"[ERROR] {document_name(task)} 처리 중 오류: {e}"
+            if task["error"] is not None:
+                task["image"] = None
+
+        out_queue.put(task)
+
+
+class StagedPipeline:
+    """
+    단계별 프로세스 풀을 크기 제한 큐로 연결한 파이프라인
+    stages : [(단계 함수, 프로세스 수), ...]
+    """
+
+    def __init__(self, stages: List[Tuple[Callable, int]], queue_size: int = 4):
+        ctx = mp.get_context("spawn")
+        self.stage_counts = [count for _, count in stages]
+        self.queues = [ctx.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+        self.processes = []
+        self.closed = False
+
+        for i, (func, count) in enumerate(stages):
+            for _ in range(count):
+                process = ctx.Process(
+                    target=_stage_worker,
+                    args=(func, self.queues[i], self.queues[i + 1]),
+                    daemon=True,
+                )
+                self.processes.append(process)
+
+    @staticmethod
+    def split_workers(total: int) -> Tuple[int, int, int]:
+        # OCR 단계가 가장 무거우므로 절반을 배정 (각 단계 최소 1개)
+        total = max(3, total)
+        load = max(1, total // 4)
+        align = max(1, total // 4)
+        return load, align, max(1, total - load - align)
+
+    def start(self):
+        for process in self.processes:
+            process.start()
+
+    def put(self, task: Dict[str, Any], timeout: float) -> bool:
+        if self.closed:
+            return False
+        try:
+            self.queues[0].put(task, timeout=timeout)
+            return True
+        except queue.Full:
+            return False
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return self.queues[-1].get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def dead_workers(self) -> List[Optional[int]]:
+        # 종료 신호 전에 끝난 프로세스의 종료 코드 (비정상 종료 감지)
+        return [
+            process.exitcode for process in self.processes if not process.is_alive()
+        ]
+
+    def close(self, timeout: float = 5.0):
+        # 모든 결과를 받은 뒤 호출: 각 단계 프로세스 수만큼 종료 신호 전달
+        for stage_queue, count in zip(self.queues, self.stage_counts):
+            for _ in range(count):
+                stage_queue.put(None)
+
+        for process in self.processes:
+            process.join(timeout)
+        self.terminate()
+
+    def terminate(self):
+        self.closed = True
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+
+        for stage_queue in self.queues:
+            stage_queue.cancel_join_thread()
+            stage_queue.close()
@@ -0,0 +1,117 @@
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from core.pipeline import StageError, document_name
+
+
+class PrefetchLoader:
+    """
+    task 이터레이터를 백그라운드 스레드에서 미리 읽어 둔다.
+    (다음 파일의 디코딩/PDF 변환과 선택적 정렬을 OCR과 겹쳐서 수행)
+
+    depth : 미리 읽어 둘 최대 task 수
+    memory_mb : 미리 읽은 이미지의 최대 메모리 (최소 1개는 항상 허용)
+    prepare : 미리 수행할 추가 처리 (예: align_stage), 예외는 task["error"]로 기록
+    """
+
+    def __init__(
+        self,
+        tasks: Iterator[Dict[str, Any]],
+        depth: int = 2,
+        memory_mb: int = 512,
+        prepare: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ):
+        self.tasks = tasks
+        self.depth = max(1, depth)
+        self.memory_budget = max(1, memory_mb) * 1024 * 1024
+        self.prepare = prepare
+
+        self._buffer = deque()  # (task, 이미지 크기)
+        self._buffer_bytes = 0
+        self._done = False
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _task_bytes(task: Dict[str, Any]) -> int:
+        image = task.get("image")
+        return image.nbytes if image is not None else 0
+
+    def _worker(self):
+        try:
+            for task in self.tasks:
+                if self.prepare and not task["error"]:
+                    try:
+                        task = self.prepare(task)
+                    except StageError as e:
+                        task["error"] = str(e)
+                    except Exception as e:
+                        task["error"] = (
+                            f"[ERROR] {document_name(task)} 처리 중 오류: {e}"
+                        )
+
+                size = self._task_bytes(task)
+                with self._cond:
+                    # 개수/메모리 한도를 넘으면 소비될 때까지 대기
+                    while (
+                        not self._closed
+                        and self._buffer
+                        and (
+                            len(self._buffer) >= self.depth
+                            or self._buffer_bytes + size > self.memory_budget
+                        )
+                    ):
+                        self._cond.wait()
+
+                    if self._closed:
+                        return
+
+                    self._buffer.append((task, size))
+                    self._buffer_bytes += size
+                    self._cond.notify_all()
+
+        except Exception as e:
+            self._error = e
+
+        finally:
+            # 열어 둔 파일 정리 (제너레이터인 경우)
+            close_tasks = getattr(self.tasks, "close", None)
+            if close_tasks:
+                close_tasks()
+
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        while True:
+            with self._cond:
+                while not self._buffer and not self._done:
+                    self._cond.wait()
+
+                if not self._buffer:
+                    break
+
+                task, size = self._buffer.popleft()
+                self._buffer_bytes -= size
+                self._cond.notify_all()
+
+            yield task
+
+        if self._error is not None:
+            raise self._error
+
+    def close(self, timeout: float = 5.0):
+        # 중지 시: 대기 중인 스레드를 깨우고 미리 읽은 task는 버린다
+        with self._cond:
+            self._closed = True
+            self._buffer.clear()
+            self._buffer_bytes = 0
+            self._cond.notify_all()
+
+        self._thread.join(timeout)
@@ -1,6 +1,10 @@
+import hashlib
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional, TypedDict, Tuple, Union
+from typing import Dict, List, Any, NotRequired, Optional, TypedDict, Tuple, Union
+
+from core.keyword_matcher import KeywordMatcher
+from core.image_aligner import ImageAligner
 
 
 class RoiData(TypedDict):
@@ -10,24 +14,36 @@ class RoiData(TypedDict):
     w: float
     h: float
     dtype: str
+    remove_lines: NotRequired[bool]  # 표 테두리 제거 후 인식 (없으면 False)
+
+
+class AlignSettings(TypedDict, total=False):
+    max_features: int
+    good_match_percent: float
+    matcher: str  # "bf" / "ratio" / "flann"
 
 
-class ProfileData(TypedDict):
+class ProfileData(TypedDict, total=False):
     keywords: List[str]
     rois: List[RoiData]
     ref_w: int
     ref_h: int
     sample_image_path: str
     template_path: str
+    align_settings: AlignSettings  # 없으면 ImageAligner 기본값
+    # dtype별 빈 칸 기준 잉크 비율 (없으면 OCREngine 기본값)
+    blank_thresholds: Dict[str, float]
 
 
 class ProfileManager:
     def __init__(self, filename: str = "profiles.json"):
         self.file_path = Path(filename)
         self.profiles: Dict[str, ProfileData] = {}
+        self._keyword_matcher: Optional[KeywordMatcher] = None
         self.load_profiles()
 
     def load_profiles(self) -> None:
+        self._keyword_matcher = None
         if not self.file_path.exists():
             self.profiles = {}
             return
@@ -40,6 +56,8 @@ class ProfileManager:
             self.profiles = {}
 
     def save_profiles(self):
+        # 키워드/순서가 바뀌었을 수 있으므로 다음 매칭 때 다시 구성
+        self._keyword_matcher = None
         try:
             with self.file_path.open("w", encoding="utf-8") as f:
                 json.dump(self.profiles, f, ensure_ascii=False, indent=4)
@@ -54,6 +72,37 @@ class ProfileManager:
     def get_profile(self, name: str) -> Optional[ProfileData]:
         return self.profiles.get(name)
 
+    @staticmethod
+    def profile_version(profile_data: Optional[ProfileData]) -> str:
+        """
+        인식 결과에 영향을 주는 설정(ROI, 템플릿 내용, 정렬 설정 등)의 해시
+        (키워드/샘플 이미지 경로만 바뀐 경우는 같은 버전)
+        """
+        data = {
+            k: v
+            for k, v in (profile_data or {}).items()
+            if k not in ("keywords", "sample_image_path")
+        }
+        template_path = data.get("template_path", "")
+        if template_path and Path(template_path).exists():
+            data["template_hash"] = ImageAligner.template_hash(template_path)
+
+        text = json.dumps(data, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def resolve_profile(self, filename: str) -> Optional[str]:
+        """
+        파일명에 포함된 키워드로 서식 이름을 찾는다 (없으면 None).
+        여러 서식이 맞으면 가장 긴 키워드의 서식, 길이가 같으면 목록에서 앞선 서식
+        """
+        if self._keyword_matcher is None:
+            self._keyword_matcher = KeywordMatcher(
+                (keyword, name)
+                for name, profile in self.profiles.items()
+                for keyword in profile.get("keywords", [])
+            )
+        return self._keyword_matcher.best_match(filename)
+
     def add_profile(
         self,
         name: str,
@@ -88,14 +137,19 @@ class ProfileManager:
                         }
                     )
 
-        self.profiles[name] = {
-            "keywords": keywords,
-            "rois": rois_ratio,  # 비율로 저장됨
-            "ref_w": ref_w,
-            "ref_h": ref_h,
-            "sample_image_path": image_path,
-            "template_path": template_path,
-        }
+        # 편집기에서 다루지 않는 설정(align_settings 등)은 유지
+        profile = dict(self.profiles.get(name, {}))
+        profile.update(
+            {
+                "keywords": keywords,
+                "rois": rois_ratio,  # 비율로 저장됨
+                "ref_w": ref_w,
+                "ref_h": ref_h,
+                "sample_image_path": image_path,
+                "template_path": template_path,
+            }
+        )
+        self.profiles[name] = profile
         return self.save_profiles()
 
     def delete_profile(self, name: str) -> bool:
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from core.constants import AppConfig
+
+
+class ResultStore:
+    """
+    ROI 단위 인식 결과 저장소 (같은 파일을 다시 처리할 때 바뀐 ROI만 인식)
+
+    rois  : (파일 내용 해시, 페이지, ROI 키) -> 인식 결과
+    pages : (파일 내용 해시, 페이지, 처리 조건 키) -> 정렬 정보 (검증 화면용 숨김 컬럼)
+    files : (경로, 수정 시각/크기) -> 파일 내용 해시 (바뀌지 않은 파일은 다시 읽지 않음)
+
+    처리 조건 키 : 템플릿 내용/정렬 설정/처리 옵션 등 ROI 정의를 뺀 서식 설정
+    ROI 키 : 처리 조건 키 + ROI 정의(위치, 크기, dtype) - 컬럼 이름만 바꾸면 그대로 재사용
+    """
+
+    COMMIT_ROWS = 200  # 이만큼 쌓이면 커밋
+    COMMIT_SECONDS = 2.0  # 마지막 커밋 후 이 시간이 지나면 커밋
+    META_COLUMNS = ("align_status", "inlier_ratio", "homography", "ocr_confidence")
+
+    def __init__(self, db_path: Union[str, Path] = AppConfig.RESULT_STORE_PATH):
+        self.db_path = Path(db_path)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT NOT NULL,
+                file_stamp TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                PRIMARY KEY (path, file_stamp)
+            );
+            CREATE TABLE IF NOT EXISTS rois (
+                content_hash TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                roi_key TEXT NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (content_hash, page, roi_key)
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                content_hash TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                context_key TEXT NOT NULL,
+                meta TEXT NOT NULL,
+                PRIMARY KEY (content_hash, page, context_key)
+            );
+            """)
+        self._conn.commit()
+
+        self._pending: Dict[str, List[tuple]] = {"files": [], "rois": [], "pages": []}
+        self._pending_count = 0
+        self._last_commit = time.monotonic()
+        self._hashes: Dict[Tuple[str, str], str] = {}  # 이번 실행에서 구한 내용 해시
+
+    @staticmethod
+    def _hash(data: Any) -> str:
+        text = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def context_key(profile_version: str, options: Dict[str, Any]) -> str:
+        """
+        profile_version : ROI를 뺀 서식 버전 (ProfileManager.profile_version)
+        options : 인식 결과에 영향을 주는 처리 옵션 (OCR 방식, 백엔드, 정렬/PDF 옵션)
+        """
+        return ResultStore._hash({"profile": profile_version, "options": options})
+
+    @staticmethod
+    def roi_keys(context_key: str, rois: List[Dict]) -> Dict[str, str]:
+        # {컬럼 이름: ROI 키}
+        return {
+            roi["col_name"]: ResultStore._hash(
+                [context_key, {k: v for k, v in roi.items() if k != "col_name"}]
+            )
+            for roi in rois
+        }
+
+    def content_hash(self, path: str, file_stamp: str) -> str:
+        content_hash = self._hashes.get((path, file_stamp))
+        if content_hash:
+            return content_hash
+
+        row = self._conn.execute(
+            "SELECT content_hash FROM files WHERE path = ? AND file_stamp = ?",
+            (path, file_stamp),
+        ).fetchone()
+        if row:
+            self._hashes[(path, file_stamp)] = row[0]
+            return row[0]
+
+        # 내용 해시: 파일을 옮기거나 다시 저장해도 내용이 같으면 같은 결과 사용
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+
+        self._hashes[(path, file_stamp)] = content_hash
+        self._add("files", (path, file_stamp, content_hash))
+        return content_hash
+
+    def lookup(
+        self,
+        content_hash: str,
+        page: int,
+        context_key: str,
+        roi_keys: Dict[str, str],
+    ) -> Tuple[Dict[str, str], Optional[Dict[str, Any]]]:
+        """반환값 : ({컬럼 이름: 저장된 결과}, 정렬 정보 또는 None) - 커밋된 기록만 조회"""
+        stored = dict(
+            self._conn.execute(
+                "SELECT roi_key, text FROM rois WHERE content_hash = ? AND page = ?",
+                (content_hash, page),
+            ).fetchall()
+        )
+        texts = {
+            col_name: stored[key] for col_name, key in roi_keys.items() if key in stored
+        }
+
+        row = self._conn.execute(
+            "SELECT meta FROM pages"
+            " WHERE content_hash = ? AND page = ? AND context_key = ?",
+            (content_hash, page, context_key),
+        ).fetchone()
+        return texts, (json.loads(row[0]) if row else None)
+
+    def record(
+        self,
+        content_hash: str,
+        page: int,
+        context_key: str,
+        roi_keys: Dict[str, str],
+        row_data: Dict[str, Any],
+    ) -> None:
+        for col_name, key in roi_keys.items():
+            if col_name in row_data:
+                self._add("rois", (content_hash, page, key, str(row_data[col_name])))
+
+        meta = {name: row_data.get(name, "") for name in self.META_COLUMNS}
+        self._add(
+            "pages",
+            (content_hash, page, context_key, json.dumps(meta, ensure_ascii=False)),
+        )
+
+    def _add(self, table: str, values: tuple) -> None:
+        self._pending[table].append(values)
+        self._pending_count += 1
+
+        if (
+            self._pending_count >= self.COMMIT_ROWS
+            or time.monotonic() - self._last_commit >= self.COMMIT_SECONDS
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending_count:
+            with self._conn:
+                for table, rows in self._pending.items():
+                    if rows:
+                        placeholders = ", ".join("?" * len(rows[0]))
+                        self._conn.executemany(
+                            f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})",
+                            rows,
+                        )
+                        rows.clear()
+            self._pending_count = 0
+        self._last_commit = time.monotonic()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
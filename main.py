@@ -2,6 +2,7 @@ import sys
 import os
 import time
 import ctypes
+import multiprocessing
 from PySide6.QtWidgets import QApplication, QSplashScreen
 from PySide6.QtGui import QPixmap, QFontDatabase, QFont, QPainter, QColor, QIcon
 from PySide6.QtCore import Qt, QRect
@@ -123,4 +124,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 병렬 처리(spawn) 워커가 exe 빌드에서도 동작하도록
+    multiprocessing.freeze_support()
     main()
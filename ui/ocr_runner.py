@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from PySide6.QtWidgets import (
     QWidget,
@@ -13,6 +14,8 @@ from PySide6.QtWidgets import (
     QListWidget,
     QSplitter,
     QListWidgetItem,
+    QSpinBox,
+    QCheckBox,
 )
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QShortcut, QKeySequence
@@ -45,6 +48,7 @@ class OCRRunner(QWidget):
         left_layout.setContentsMargins(0, 0, 0, 0)
 
         left_layout.addWidget(self._create_profile_group())
+        left_layout.addWidget(self._create_option_group())
         left_layout.addWidget(self._create_input_group())
 
         # [우측 패널] 버튼, 로그
@@ -82,8 +86,17 @@ class OCRRunner(QWidget):
         self.mode_group.addButton(self.radio_manual)
         self.mode_group.buttonClicked.connect(self.toggle_profile_combo)
 
+        # 자동 매칭 보조: 파일명에 키워드가 없으면 페이지 내용으로 서식 분류
+        self.chk_classify = QCheckBox("키워드 없으면 내용으로 분류")
+        self.chk_classify.setToolTip(
+            "파일명으로 서식을 찾지 못한 문서는 템플릿과 비교하여 서식을 고릅니다."
+        )
+        self.chk_classify.setChecked(True)
+        self.chk_classify.setEnabled(False)
+
         radio_layout.addWidget(self.radio_auto)
         radio_layout.addWidget(self.radio_manual)
+        radio_layout.addWidget(self.chk_classify)
         radio_layout.addStretch()
 
         layout.addLayout(radio_layout)
@@ -100,6 +113,127 @@ class OCRRunner(QWidget):
         group.setLayout(layout)
         return group
 
+    def _create_option_group(self):
+        group = QGroupBox("처리 옵션")
+        layout = QVBoxLayout()
+
+        # OCR 방식 / 병렬 처리
+        mode_layout = QHBoxLayout()
+
+        self.combo_ocr_mode = QComboBox()
+        self.combo_ocr_mode.addItem("ROI별 인식", BatchProcessor.MODE_ROI)
+        self.combo_ocr_mode.addItem("페이지 단위 합성 인식", BatchProcessor.MODE_PAGE)
+        self.combo_ocr_mode.addItem("열 단위 배치 인식", BatchProcessor.MODE_COLUMN)
+
+        self.spin_workers = QSpinBox()
+        self.spin_workers.setRange(0, os.cpu_count() or 1)
+        self.spin_workers.setSpecialValueText("순차")
+        self.spin_workers.setToolTip(
+            "0이면 순차 처리, 그 외에는 단계별 프로세스 수의 합"
+        )
+
+        self.combo_result_order = QComboBox()
+        self.combo_result_order.addItem("입력 순서", BatchProcessor.ORDER_INPUT)
+        self.combo_result_order.addItem("완료 순서", BatchProcessor.ORDER_COMPLETION)
+
+        mode_layout.addWidget(QLabel("OCR 방식:"))
+        mode_layout.addWidget(self.combo_ocr_mode, 1)
+        mode_layout.addWidget(QLabel("병렬 프로세스:"))
+        mode_layout.addWidget(self.spin_workers)
+        mode_layout.addWidget(self.combo_result_order)
+
+        self.chk_resume = QCheckBox("이어하기")
+        self.chk_resume.setToolTip(
+            "이전 작업에서 이미 처리한 파일(파일/서식 설정이 같은 경우)은 건너뜁니다."
+        )
+        mode_layout.addWidget(self.chk_resume)
+
+        self.chk_incremental = QCheckBox("바뀐 영역만 인식")
+        self.chk_incremental.setToolTip(
+            "이전에 인식한 파일은 내용과 ROI 설정이 바뀐 영역만 다시 인식합니다."
+        )
+        mode_layout.addWidget(self.chk_incremental)
+
+        self.chk_ocr_cache = QCheckBox("인식 캐시 저장")
+        self.chk_ocr_cache.setToolTip(
+            "같은 모양의 영역(인쇄 문구, 빈 칸 등)의 인식 결과를 파일에 저장하여\n"
+            "다음 작업과 병렬 프로세스에서도 다시 인식하지 않습니다."
+        )
+        mode_layout.addWidget(self.chk_ocr_cache)
+        layout.addLayout(mode_layout)
+
+        # 미리 읽기 (순차 처리)
+        prefetch_layout = QHBoxLayout()
+
+        self.spin_prefetch = QSpinBox()
+        self.spin_prefetch.setRange(0, 16)
+        self.spin_prefetch.setSpecialValueText("끔")
+        self.spin_prefetch.setToolTip(
+            "순차 처리 시 OCR 중에 다음 파일을 미리 읽어 둘 개수"
+        )
+
+        self.spin_prefetch_mb = QSpinBox()
+        self.spin_prefetch_mb.setRange(64, 8192)
+        self.spin_prefetch_mb.setSingleStep(64)
+        self.spin_prefetch_mb.setValue(512)
+        self.spin_prefetch_mb.setSuffix(" MB")
+        self.spin_prefetch_mb.setToolTip("미리 읽은 이미지가 사용할 최대 메모리")
+
+        self.chk_prefetch_align = QCheckBox("정렬까지 미리 수행")
+
+        prefetch_layout.addWidget(QLabel("미리 읽기:"))
+        prefetch_layout.addWidget(self.spin_prefetch)
+        prefetch_layout.addWidget(self.spin_prefetch_mb)
+        prefetch_layout.addWidget(self.chk_prefetch_align)
+        prefetch_layout.addStretch()
+        layout.addLayout(prefetch_layout)
+
+        # 정렬 옵션
+        align_layout = QHBoxLayout()
+
+        self.chk_pyramid = QCheckBox("고속 정렬 (축소본에서 추정)")
+        self.chk_roi_warp = QCheckBox("ROI 영역만 보정")
+        self.chk_roi_warp.setToolTip("페이지 전체 대신 추출 영역만 원근 변환합니다.")
+
+        self.chk_fast_check = QCheckBox("정렬 사전 점검")
+        self.chk_fast_check.setToolTip(
+            "이미 서식에 맞춰진 스캔본은 특징점 정합을 건너뜁니다."
+        )
+
+        align_layout.addWidget(self.chk_pyramid)
+        align_layout.addWidget(self.chk_roi_warp)
+        self.chk_grayscale = QCheckBox("흑백으로 처리")
+        self.chk_grayscale.setToolTip(
+            "이미지를 처음부터 흑백(1채널)으로 읽어 메모리 사용량을 줄입니다."
+        )
+
+        align_layout.addWidget(self.chk_fast_check)
+        align_layout.addWidget(self.chk_grayscale)
+        align_layout.addStretch()
+        layout.addLayout(align_layout)
+
+        # PDF 옵션
+        pdf_layout = QHBoxLayout()
+
+        self.chk_pdf_clip = QCheckBox("PDF는 ROI만 고해상도 변환")
+        self.chk_pdf_clip.setToolTip(
+            "PDF 페이지는 저해상도로 정렬하고 인식할 영역만 300DPI로 변환합니다."
+        )
+
+        self.chk_pdf_text = QCheckBox("PDF 내장 텍스트 사용")
+        self.chk_pdf_text.setToolTip(
+            "텍스트 레이어가 있는 PDF는 OCR 없이 내장 텍스트를 읽습니다.\n"
+            "스캐너가 만든 검색 가능 PDF는 정렬 없이 스캐너의 OCR 결과를 읽으므로 주의"
+        )
+
+        pdf_layout.addWidget(self.chk_pdf_clip)
+        pdf_layout.addWidget(self.chk_pdf_text)
+        pdf_layout.addStretch()
+        layout.addLayout(pdf_layout)
+
+        group.setLayout(layout)
+        return group
+
     def _create_input_group(self):
         group = QGroupBox("대상 파일")
         layout = QVBoxLayout()
@@ -171,6 +305,7 @@ class OCRRunner(QWidget):
 
     def toggle_profile_combo(self):
         self.combo_profile.setEnabled(self.radio_manual.isChecked())
+        self.chk_classify.setEnabled(self.radio_auto.isChecked())
 
     def _add_file_item(self, file_path):
         if file_path not in self.target_files:
@@ -257,6 +392,22 @@ class OCRRunner(QWidget):
         self.combo_profile.setEnabled(not is_running and self.radio_manual.isChecked())
         self.radio_auto.setEnabled(not is_running)
         self.radio_manual.setEnabled(not is_running)
+        self.chk_classify.setEnabled(not is_running and self.radio_auto.isChecked())
+        self.combo_ocr_mode.setEnabled(not is_running)
+        self.spin_workers.setEnabled(not is_running)
+        self.combo_result_order.setEnabled(not is_running)
+        self.chk_resume.setEnabled(not is_running)
+        self.chk_incremental.setEnabled(not is_running)
+        self.chk_ocr_cache.setEnabled(not is_running)
+        self.chk_pyramid.setEnabled(not is_running)
+        self.chk_roi_warp.setEnabled(not is_running)
+        self.chk_fast_check.setEnabled(not is_running)
+        self.chk_pdf_clip.setEnabled(not is_running)
+        self.chk_pdf_text.setEnabled(not is_running)
+        self.chk_grayscale.setEnabled(not is_running)
+        self.spin_prefetch.setEnabled(not is_running)
+        self.spin_prefetch_mb.setEnabled(not is_running)
+        self.chk_prefetch_align.setEnabled(not is_running)
 
     def start_processing(self):
         if not self.target_files:
@@ -278,7 +429,26 @@ class OCRRunner(QWidget):
         self.progress_bar.setValue(0)
         self.log_view.append_log("--- 작업 시작 ---")
 
-        self.processor = BatchProcessor(self.target_files, forced_profile)
+        self.processor = BatchProcessor(
+            self.target_files,
+            forced_profile,
+            ocr_mode=self.combo_ocr_mode.currentData(),
+            workers=self.spin_workers.value(),
+            result_order=self.combo_result_order.currentData(),
+            pyramid_align=self.chk_pyramid.isChecked(),
+            roi_warp=self.chk_roi_warp.isChecked(),
+            fast_align_check=self.chk_fast_check.isChecked(),
+            pdf_clip=self.chk_pdf_clip.isChecked(),
+            pdf_text=self.chk_pdf_text.isChecked(),
+            grayscale=self.chk_grayscale.isChecked(),
+            prefetch_depth=self.spin_prefetch.value(),
+            prefetch_memory_mb=self.spin_prefetch_mb.value(),
+            prefetch_align=self.chk_prefetch_align.isChecked(),
+            classify_forms=self.chk_classify.isChecked(),
+            resume=self.chk_resume.isChecked(),
+            incremental=self.chk_incremental.isChecked(),
+            ocr_cache_disk=self.chk_ocr_cache.isChecked(),
+        )
         self.processor.log_signal.connect(self.log_view.append_log)
         self.processor.progress_signal.connect(self.update_progress)
         self.processor.finished_signal.connect(self.on_finished)
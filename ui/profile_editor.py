@@ -7,6 +7,7 @@ from PySide6.QtWidgets import (
     QListWidget,
     QPushButton,
     QComboBox,
+    QCheckBox,
     QLabel,
     QLineEdit,
     QSplitter,
@@ -21,8 +22,8 @@ from PySide6.QtCore import Qt, QSize, QEvent
 from core.profile_manager import ProfileManager
 from core.ocr_engine import OCREngine
 from core.constants import AppConfig
-from core.image_loader import ImageLoader
 from core.image_aligner import ImageAligner
+from core.image_cache import ImageCache
 from ui.editor_widget import ROISelector
 from ui.profile_dialog import KeywordSettingsDialog
 from ui.components import ActionButton, LogView, TitleLabel
@@ -56,6 +57,7 @@ class ROIItemWidget(QWidget):
         delete_callback,
         select_callback=None,
         dtype="전체",
+        remove_lines=False,
     ):
         super().__init__()
         layout = QHBoxLayout(self)
@@ -73,7 +75,9 @@ class ROIItemWidget(QWidget):
         self.name_edit.installEventFilter(self)
         self.name_edit.editingFinished.connect(
             lambda: change_callback(
-                self.name_edit.text(), self.type_combo.currentText()
+                self.name_edit.text(),
+                self.type_combo.currentText(),
+                self.chk_lines.isChecked(),
             )
         )
 
@@ -82,12 +86,24 @@ class ROIItemWidget(QWidget):
         self.type_combo.setCurrentText(dtype)
         self.type_combo.currentTextChanged.connect(
             lambda: change_callback(
-                self.name_edit.text(), self.type_combo.currentText()
+                self.name_edit.text(),
+                self.type_combo.currentText(),
+                self.chk_lines.isChecked(),
+            )
+        )
+
+        self.chk_lines = QCheckBox("선 제거")
+        self.chk_lines.setToolTip("영역에 걸친 표 테두리(가로/세로 선)를 지우고 인식")
+        self.chk_lines.setChecked(remove_lines)
+        self.chk_lines.toggled.connect(
+            lambda checked: change_callback(
+                self.name_edit.text(), self.type_combo.currentText(), checked
             )
         )
 
         layout.addWidget(self.name_edit, 3)
         layout.addWidget(self.type_combo, 2)
+        layout.addWidget(self.chk_lines)
 
         self.btn_delete = QPushButton("❌")
         self.btn_delete.setFixedSize(28, 24)
@@ -108,6 +124,7 @@ class ProfileEditor(QWidget):
         super().__init__()
         self.profile_manager = ProfileManager()
         self.ocr_engine = OCREngine()
+        self.image_cache = ImageCache()
 
         self.current_image = None
         self.current_image_path = None
@@ -335,10 +352,13 @@ class ProfileEditor(QWidget):
 
             widget = ROIItemWidget(
                 roi["col_name"],
-                lambda name, dtype, i=idx: self.update_roi_data(i, name, dtype),
+                lambda name, dtype, lines, i=idx: self.update_roi_data(
+                    i, name, dtype, lines
+                ),
                 lambda i=idx: self.delete_roi_by_index(i),
                 select_callback=lambda it=item: self._on_roi_item_clicked(it),
                 dtype=current_dtype,
+                remove_lines=bool(roi.get("remove_lines")),
             )
             self.roi_list_widget.setItemWidget(item, widget)
 
@@ -490,23 +510,26 @@ class ProfileEditor(QWidget):
             return False
 
         try:
-            loaded_image = ImageLoader.load_image(path_obj)
-            if loaded_image is None:
-                raise Exception("이미지 데이터를 읽을 수 없습니다.")
-
+            h_matrix = None
             if self.current_template_path and Path(self.current_template_path).exists():
-                template_img = ImageLoader.load_image(self.current_template_path)
+                profile_data = self.profile_manager.get_profile(
+                    self.loaded_profile_name
+                )
+                loaded_image, h_matrix = self.image_cache.load_aligned(
+                    path_obj,
+                    self.current_template_path,
+                    ImageAligner.get_profile_settings(profile_data),
+                )
+            else:
+                loaded_image = self.image_cache.load_image(path_obj)
 
-                if template_img is not None:
-                    aligned_image, h_matrix = ImageAligner.align_images(
-                        loaded_image, template_img
-                    )
+            if loaded_image is None:
+                raise Exception("이미지 데이터를 읽을 수 없습니다.")
 
-                    if h_matrix is not None:
-                        loaded_image = aligned_image
-                        self.log_view.append_log(
-                            "✨ 샘플 이미지가 템플릿 서식에 맞춰 자동 보정되었습니다."
-                        )
+            if h_matrix is not None:
+                self.log_view.append_log(
+                    "✨ 샘플 이미지가 템플릿 서식에 맞춰 자동 보정되었습니다."
+                )
 
             self.current_image = loaded_image
             self.current_image_path = file_path
@@ -586,12 +609,13 @@ class ProfileEditor(QWidget):
 
         self.loaded_profile_name = name
 
-    def update_roi_data(self, index, new_name, new_dtype):
+    def update_roi_data(self, index, new_name, new_dtype, remove_lines=False):
         if 0 <= index < len(self.rois):
             # 변경 사항이 있을 때만 실행
             if (
                 self.rois[index]["col_name"] != new_name
                 or self.rois[index].get("dtype", "전체") != new_dtype
+                or bool(self.rois[index].get("remove_lines")) != remove_lines
             ):
 
                 self.save_state_for_undo()  # 실행 취소를 위한 스냅샷 저장
@@ -599,13 +623,21 @@ class ProfileEditor(QWidget):
 
                 self.rois[index]["col_name"] = new_name
                 self.rois[index]["dtype"] = new_dtype
+                # 끈 경우 키를 남기지 않음 (이전 결과 재사용 키가 바뀌지 않도록)
+                if remove_lines:
+                    self.rois[index]["remove_lines"] = True
+                else:
+                    self.rois[index].pop("remove_lines", None)
 
                 # 리스트 위젯의 실제 아이템 데이터도 동기화
                 item = self.roi_list_widget.item(index)
                 if item:
                     item.setData(Qt.UserRole, new_name)
 
-                self.log_view.append_log(f"📝 ROI 수정: {new_name} ({new_dtype})")
+                option = ", 선 제거" if remove_lines else ""
+                self.log_view.append_log(
+                    f"📝 ROI 수정: {new_name} ({new_dtype}{option})"
+                )
 
     # Delete
 
@@ -663,10 +695,18 @@ class ProfileEditor(QWidget):
             px, py, pw, ph = ROISelector.to_pixel_rect(roi, curr_w, curr_h)
 
             try:
-                text = self.ocr_engine.extract_text_from_roi(
+                x, y, w, h = self.ocr_engine.clamp_rect(
                     self.current_image, px, py, pw, ph
                 )
-                self.log_view.append_log(f"<b>[{roi['col_name']}]</b> : {text}")
+                result = self.ocr_engine.recognize_roi(
+                    self.current_image[y : y + h, x : x + w],
+                    roi.get("dtype", "전체"),
+                    remove_lines=bool(roi.get("remove_lines")),
+                )
+                self.log_view.append_log(
+                    f"<b>[{roi['col_name']}]</b> : {result.text}"
+                    f" (신뢰도 {result.confidence:.0f})"
+                )
             except Exception as e:
                 self.log_view.append_log(f"[{roi['col_name']}] 오류: {str(e)}")
 
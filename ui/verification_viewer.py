@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
@@ -21,8 +22,8 @@ from PySide6.QtGui import QFont, QColor, QPen
 from core.profile_manager import ProfileManager
 from core.ocr_engine import OCREngine
 from core.constants import AppConfig
-from core.image_loader import ImageLoader
 from core.image_aligner import ImageAligner
+from core.image_cache import ImageCache
 from ui.editor_widget import ROISelector
 from ui.components import ActionButton
 
@@ -31,12 +32,25 @@ class VerificationViewer(QWidget):
     TABLE_STYLE = "QTableWidget::item { padding: 4px 10px; }"
     GUIDE_STYLE = "margin-right: 5px; color: #ff7f00;"
 
+    # 화면에는 숨기고 엑셀에는 저장하는 컬럼 (원본 파일 경로, 페이지 번호)
+    META_COLUMNS = (
+        "full_path",
+        "page",
+        "align_status",
+        "inlier_ratio",
+        "homography",
+        "file_stamp",
+        "ocr_confidence",
+    )
+    LOW_CONFIDENCE_COLOR = "#ffe0b2"  # 인식 신뢰도가 낮은 셀 배경
+
     def __init__(self):
         super().__init__()
         self.current_results = {}
         self.current_df = None
         self.profile_manager = ProfileManager()
         self.ocr_engine = OCREngine()
+        self.image_cache = ImageCache()
 
         self.init_ui()
 
@@ -118,14 +132,24 @@ class VerificationViewer(QWidget):
         headers = self.current_df.columns.astype(str).tolist()
         self.table.setHorizontalHeaderLabels(headers)
 
-        full_path_idx = headers.index("full_path") if "full_path" in headers else -1
+        meta_indices = [
+            headers.index(name) for name in self.META_COLUMNS if name in headers
+        ]
 
         for r in range(rows):
+            confidences = self._row_confidences(r, headers)
             for c in range(cols):
                 val = str(self.current_df.iat[r, c])
                 item = QTableWidgetItem(val)
 
-                if c == full_path_idx:
+                # 신뢰도가 낮은 인식 결과는 확인하기 쉽도록 표시
+                confidence = confidences.get(headers[c])
+                if confidence is not None:
+                    item.setToolTip(f"인식 신뢰도: {confidence:.0f}")
+                    if confidence < OCREngine.ESCALATE_CONFIDENCE:
+                        item.setBackground(QColor(self.LOW_CONFIDENCE_COLOR))
+
+                if c in meta_indices:
                     item.setFlags(item.flags() ^ Qt.ItemIsEditable)
                 else:
                     item.setFlags(item.flags() | Qt.ItemIsEditable)
@@ -140,8 +164,8 @@ class VerificationViewer(QWidget):
 
         self.table.resizeColumnsToContents()
 
-        if full_path_idx != -1:
-            self.table.setColumnHidden(full_path_idx, True)
+        for c in meta_indices:
+            self.table.setColumnHidden(c, True)
 
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.Interactive)
@@ -218,6 +242,15 @@ class VerificationViewer(QWidget):
         else:
             df["파일명"] = "-"
 
+        # 여러 페이지 파일의 문서는 "파일명#페이지"로 표시
+        if "page" in df.columns:
+            pages = df["page"].apply(self._page_number)
+            df["page"] = pages.apply(lambda p: "" if p is None else p)
+            df["파일명"] = [
+                name if page is None else f"{name}#{page}"
+                for name, page in zip(df["파일명"], pages)
+            ]
+
         profile_data = self.profile_manager.get_profile(profile_name)
         roi_order = (
             [roi["col_name"] for roi in profile_data.get("rois", [])]
@@ -227,19 +260,29 @@ class VerificationViewer(QWidget):
 
         final_columns = ["파일명"] + roi_order
 
-        if "full_path" in df.columns:
-            final_columns.append("full_path")
+        for name in self.META_COLUMNS:
+            if name in df.columns:
+                final_columns.append(name)
 
         for col in df.columns:
             if col not in final_columns:
                 final_columns.append(col)
 
         df = df.reindex(columns=final_columns)
-        display_cols = [c for c in df.columns if c != "full_path"]
+        display_cols = [c for c in df.columns if c not in self.META_COLUMNS]
         df[display_cols] = df[display_cols].fillna("-").replace("", "-")
 
         return df
 
+    @staticmethod
+    def _page_number(value):
+        # 엑셀에서 읽으면 빈 값/실수로 들어오므로 정수 또는 None으로 정리
+        try:
+            page = int(float(value))
+        except (TypeError, ValueError):
+            return None
+        return page if page > 0 else None
+
     # Event Handlers
 
     def on_sheet_changed(self):
@@ -272,28 +315,39 @@ class VerificationViewer(QWidget):
                 self._show_image_error("이미지 파일이 없습니다.")
                 return
 
-            # 이미지 로드 및 표시
-            img = ImageLoader.load_image(full_path)
-
-            if img is None:
-                return
+            # 이미지 로드 및 표시 (여러 페이지 파일은 해당 페이지)
+            page = None
+            if "page" in headers:
+                page_item = self.table.item(row, headers.index("page"))
+                page = self._page_number(page_item.text()) if page_item else None
 
+            # 같은 행의 다른 셀을 눌러도 다시 읽거나 정렬하지 않도록 캐시 사용
+            page_index = (page or 1) - 1
             current_profile_name = self.combo_sheet.currentText()
             profile_data = self.profile_manager.get_profile(current_profile_name)
+            template_path = (
+                profile_data.get("template_path", "") if profile_data else ""
+            )
 
-            if profile_data:
-                template_path = profile_data.get("template_path", "")
-                if template_path and Path(template_path).exists():
-                    # 템플릿 이미지 로드 (보정 없이 순수하게)
-                    template_img = ImageLoader.load_image(template_path)
-
-                    if template_img is not None:
-                        aligned_img, h_matrix = ImageAligner.align_images(
-                            img, template_img
-                        )
+            if template_path and Path(template_path).exists():
+                settings = ImageAligner.get_profile_settings(profile_data)
+                # 배치에서 구한 행렬이 있으면 재사용 (파일이 바뀌었으면 다시 정렬)
+                self.image_cache.restore_matrix(
+                    self._meta_value(row, headers, "homography"),
+                    self._meta_value(row, headers, "file_stamp"),
+                    full_path,
+                    template_path,
+                    settings,
+                    page=page_index,
+                )
+                img, _ = self.image_cache.load_aligned(
+                    full_path, template_path, settings, page=page_index
+                )
+            else:
+                img = self.image_cache.load_image(full_path, page=page_index)
 
-                        if h_matrix is not None:
-                            img = aligned_img
+            if img is None:
+                return
 
             self.image_viewer.set_image(img, reset_view=True)
             self.image_viewer.fitInView(
@@ -304,6 +358,22 @@ class VerificationViewer(QWidget):
         except Exception as e:
             print(f"이미지 로드 에러: {e}")
 
+    def _row_confidences(self, row, headers):
+        if "ocr_confidence" not in headers:
+            return {}
+        value = self.current_df.iat[row, headers.index("ocr_confidence")]
+        try:
+            confidences = json.loads(value) if isinstance(value, str) else {}
+        except ValueError:
+            return {}
+        return confidences if isinstance(confidences, dict) else {}
+
+    def _meta_value(self, row, headers, name):
+        if name not in headers:
+            return ""
+        item = self.table.item(row, headers.index(name))
+        return item.text() if item else ""
+
     def _show_image_error(self, message):
         self.image_viewer.scene.clear()
         text_item = self.image_viewer.scene.addText(message)